@@ -5,6 +5,126 @@
 # Please set PyCharm to Dark Mode for best game board experience.
 
 
+def cell_bit(row, col):
+    """
+    Bitboards hold one bit per playable square: bit (row - 1) * 20 + col.
+    :param row: row coordinate, 1-20 (int)
+    :param col: column coordinate, 0-19 (int)
+    :return: single bit mask for the square (int)
+    """
+    return 1 << ((row - 1) * 20 + col)
+
+
+def shift_bits(bits, count):
+    """
+    :param bits: bitboard (int)
+    :param count: bit positions to shift toward higher squares, negative toward lower squares (int)
+    :return: shifted bitboard (int)
+    """
+    return bits << count if count >= 0 else bits >> -count
+
+
+# Footprint bits in NW, N, NE, W, C, E, SW, S, SE order for every valid piece center.
+FOOTPRINT_BITS = {(row, col): [1 << ((row-1) * 20 + col + offset) for offset in (-21, -20, -19, -1, 0, 1, 19, 20, 21)]
+                  for row in range(2, 20) for col in range(1, 19)}
+FOOTPRINT_MASKS = {tup: sum(bits) for tup, bits in FOOTPRINT_BITS.items()}
+
+# (center bit, surrounding eight bits) for every square that may hold a ring.
+RINGS = [(bits[4], FOOTPRINT_MASKS[tup] ^ bits[4]) for tup, bits in FOOTPRINT_BITS.items()]
+CENTER_MASK = sum(center for center, ring in RINGS)
+
+# Alphanumeric position ('A2') of every square, keyed by (row, column).
+LABELS = {(row, col): chr(ord('A')+col) + str(row) for row in range(1, 21) for col in range(20)}
+
+# Piece center (row, column) by alphanumeric position, in upper and lower case ('C3' and 'c3').
+CENTERS = {label: tup for tup in FOOTPRINT_BITS for label in (LABELS[tup], LABELS[tup].lower())}
+
+
+def _ring_reach():
+    """
+    Shifts a 5x5 block over each piece center; squares it wraps onto sit in columns A and T, never centers.
+    :return: dict of the ring centers whose eight surrounding squares or center overlap the
+             footprint, by piece center (row, column)
+    """
+    block = sum(1 << (row * 20 + col) for row in range(5) for col in range(5))
+    return {(row, col): shift_bits(block, (row-3) * 20 + col-2) & CENTER_MASK for row, col in FOOTPRINT_BITS}
+
+
+RING_REACH = _ring_reach()
+
+# Squares in rows 1 and 20 and columns A and T.
+EDGE_MASK = sum(cell_bit(row, col) for row in range(1, 21) for col in range(20)
+                if row in (1, 20) or col in (0, 19))
+
+
+def _zobrist_keys(count, seed=20200604):
+    """
+    Generates pseudo-random 64-bit keys with SplitMix64, which is fast to run at import time.
+    :param count: number of keys (int)
+    :param seed: starting state (int)
+    :return: list of ints
+    """
+    keys = []
+    for i in range(count):
+        seed = (seed + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        key = ((seed ^ (seed >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+        key = ((key ^ (key >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+        keys.append(key ^ (key >> 31))
+    return keys
+
+
+def _zobrist_tables():
+    """
+    A fixed seed keeps hashes identical across processes so they can be shared and stored on disk.
+    :return: (dict of 64-bit Zobrist keys for a stone of each color on each square, by color and
+              bit position, key for WHITE to move) tuple
+    """
+    keys = _zobrist_keys(801)
+    return {'B': keys[:400], 'W': keys[400:800]}, keys[800]
+
+
+ZOBRIST, ZOBRIST_WHITE_TURN = _zobrist_tables()
+
+# (footprint index, row direction, column direction) for the eight directions a piece can move.
+DIRECTIONS = [(0, -1, -1), (1, -1, 0), (2, -1, 1), (3, 0, -1), (5, 0, 1), (6, 1, -1), (7, 1, 0), (8, 1, 1)]
+
+# (footprint index, bit offset of one step) by (row direction, column direction).
+DIRECTION_STEPS = {(d_row, d_col): (index, d_row * 20 + d_col) for index, d_row, d_col in DIRECTIONS}
+
+
+def _slide_tables():
+    """
+    Squares that are not centers reached from another center hold 0, which ends a slide at the board's edge.
+    :return: (dict of the squares a piece newly covers when one step in a direction brings its
+              center to a square, by footprint index of the direction and bit index of the center,
+              list of piece center (row, column) tuples by bit index, None off the centers) tuple
+    """
+    leading_edges = {index: [0] * 400 for index, d_row, d_col in DIRECTIONS}
+    center_at = [None] * 400
+    for (row, col), mask in FOOTPRINT_MASKS.items():
+        center_at[(row-1) * 20 + col] = (row, col)
+        for index, d_row, d_col in DIRECTIONS:
+            if (row-d_row, col-d_col) in FOOTPRINT_MASKS:
+                leading_edges[index][(row-1) * 20 + col] = mask & ~FOOTPRINT_MASKS[(row-d_row, col-d_col)]
+    return leading_edges, center_at
+
+
+LEADING_EDGES, CENTER_AT = _slide_tables()
+
+
+def ring_centers(stones, occupied):
+    """
+    Finds every ring on a board in one pass by lining up each of the eight neighbors with its center.
+    :param stones: bitboard of one player's stones (int)
+    :param occupied: bitboard of all stones on the board (int)
+    :return: bitboard of the player's ring centers (int)
+    """
+    rings = CENTER_MASK & ~occupied
+    for shift in (1, 19, 20, 21):
+        rings &= stones << shift & stones >> shift
+    return rings
+
+
 class GessGame:
     """
     Class designed for playing Gess, an abstract board game. GessGame tracks player turn, game
@@ -21,6 +141,7 @@ class GessGame:
         self._game_state = 'UNFINISHED'
         self._obj_board = GessBoard()
         self._positions = self._obj_board.set_positions()
+        self._move_stack = []
 
     def get_turn(self):
         """
@@ -46,6 +167,28 @@ class GessGame:
         """
         return self._obj_board.print_board()
 
+    def get_bitboard(self, player):
+        """
+        :param player: 'B' or 'W' (string)
+        :return: bitboard of the player's stones (int)
+        """
+        return self._obj_board.get_bitboard(player)
+
+    def get_rings(self, player):
+        """
+        :param player: 'B' or 'W' (string)
+        :return: bitboard of the player's ring centers (int)
+        """
+        return self._obj_board.get_rings(player)
+
+    def get_hash(self):
+        """
+        :return: 64-bit Zobrist hash of the stones on the board and the player turn (int)
+        """
+        if self._turn == 'WHITE':
+            return self._obj_board.get_hash() ^ ZOBRIST_WHITE_TURN
+        return self._obj_board.get_hash()
+
     def set_turn(self):
         """
         Sets the player turn to the opposite player.
@@ -68,43 +211,119 @@ class GessGame:
                 self._game_state = 'BLACK_WON'
         return self._game_state
 
+    def set_position(self, board, turn, game_state):
+        """
+        Replaces the stones, player turn, and game state, and clears the move stack.
+        :param board: game board in the form returned by get_board (list of lists)
+        :param turn: 'BLACK' or 'WHITE' (string)
+        :param game_state: 'UNFINISHED', 'BLACK_WON', or 'WHITE_WON' (string)
+        :return: None
+        """
+        for row in range(1, 21):
+            for col in range(20):
+                self._obj_board.set_board(row, col, board[row][col])
+        self._positions = self._obj_board.set_positions()
+        self._turn = turn
+        self._game_state = game_state
+        self._move_stack = []
+
     def make_move(self, xy, xy2):
         """
         Utilizing helper methods, determines if start and end piece positions are valid movements
         based on Gess game rules. If valid, updates stone locations, player turn, and game state.
+        Moves made here are not recorded, so long games keep no undo history; a valid move clears
+        the move stack, as earlier pushed moves can no longer be taken back. Use push_move for
+        moves that will be taken back.
         :param xy: center position of starting piece (string)
         :param xy2: center position of ending piece (string)
         :return: True if move is valid, else False.
         """
-        xy, xy2 = xy.upper(), xy2.upper()
+        tup = self.parse_position(xy)
+        tup2 = self.parse_position(xy2)
+        if tup is False or tup2 is False or tup == tup2 or self.play(tup, tup2, False) is False:
+            return False
+        self._positions = self._obj_board.set_positions()
+        return True
 
+    def push_move(self, xy, xy2):
+        """
+        Makes a move as make_move does and pushes the squares it changed, with the prior
+        player turn and game state, onto the move stack.
+        :param xy: center position of starting piece (string)
+        :param xy2: center position of ending piece (string)
+        :return: True if move is valid, else False.
+        """
         # Changes inputs to a (row, column) tuple.
-        tup = self.get_coordinates(xy)
-        tup2 = self.get_coordinates(xy2)
+        tup = self.parse_position(xy)
+        tup2 = self.parse_position(xy2)
 
         # Checks for out of bounds row/column coordinates or identical coordinates.
         if tup is False or tup2 is False or tup == tup2:
             return False
+        if self.play(tup, tup2, True) is False:
+            return False
+
+        # Updates positions dictionary
+        self._positions = self._obj_board.set_positions()
+        return True
+
+    def apply_moves(self, moves):
+        """
+        Makes a sequence of moves as make_move does, without recording them, stopping at the first
+        illegal one. Positions are looked up in a table of parsed coordinates, and the positions
+        dictionary is updated once at the end.
+        :param moves: iterable of (start, end) center position pairs (strings)
+        :return: number of moves made, which is the index of the first illegal move if any (int)
+        """
+        count = 0
+        for xy, xy2 in moves:
+            tup = self.parse_position(xy)
+            tup2 = self.parse_position(xy2)
+            if tup is False or tup2 is False or tup == tup2 or self.play(tup, tup2, False) is False:
+                break
+            count += 1
+        self._positions = self._obj_board.set_positions()
+        return count
+
+    def parse_position(self, xy):
+        """
+        Finds the coordinates of a piece center, using the table of parsed positions when it can.
+        :param xy: center piece position, such as 'C3' or 'c3' (string)
+        :return: tuple of (row, column) coordinates, or False if the position is not a piece center
+        """
+        tup = CENTERS.get(xy)
+        if tup is None:
+            return self.get_coordinates(xy.upper()) if xy else False
+        return tup
 
+    def play(self, tup, tup2, record=True):
+        """
+        Makes a move given by parsed coordinates, leaving the positions dictionary to the caller.
+        :param tup: (row, column) tuple of starting piece coordinates
+        :param tup2: (row, column) tuple of ending piece coordinates
+        :param record: pushes the move onto the move stack, else clears the stack (bool)
+        :return: True if move is valid, else False.
+        """
         # Stores piece values in a list.
         piece = self.get_footprint(tup)
-        piece2 = self.get_footprint(tup2)
 
         # Checks for illegal starting move conditions.
         if self.legal_start(piece) is False:
             return False
 
         # If center position is blank, piece may only move up to 3 squares.
-        if self._positions.get(xy) == ' ':
+        if piece[4] == ' ':
             if self.move_three(tup, tup2, piece) is False:
                 return False
 
         # If center position contains a stone, piece may move any unobstructed distance.
-        if self._positions.get(xy) != ' ':
+        else:
             if self.legal_move(tup, tup2, piece) is False:
                 return False
 
-        # Updates starting and ending footprint values.
+        # Updates starting and ending footprint values, recording each changed square.
+        game_state = self._game_state
+        self._obj_board.begin_changes()
         self.set_footprint(tup, [" ", " ", " ", " ", " ", " ", " ", " ", " "])
         self.set_footprint(tup2, piece)
 
@@ -112,8 +331,7 @@ class GessGame:
 
             # Reverts footprint values to disallow player from destroying their own ring.
             if self.ring_present('B') is False:
-                self.set_footprint(tup, piece)
-                self.set_footprint(tup2, piece2)
+                self.undo_changes(self._obj_board.end_changes())
                 return False
 
             # If move results in destruction of WHITE player's ring, updates game state.
@@ -124,8 +342,7 @@ class GessGame:
 
             # Reverts footprint values to disallow player from destroying their own ring.
             if self.ring_present('W') is False:
-                self.set_footprint(tup, piece)
-                self.set_footprint(tup2, piece2)
+                self.undo_changes(self._obj_board.end_changes())
                 return False
 
             # If move results in destruction of BLACK player's ring, updates game state.
@@ -133,9 +350,35 @@ class GessGame:
                 self._game_state = 'WHITE_WON'
 
         self.del_edges()
+        changes = self._obj_board.end_changes()
+        if record:
+            self._move_stack.append((changes, self._turn, game_state))
+        else:
+            self._move_stack.clear()
         self.set_turn()
         return True
 
+    def pop_move(self):
+        """
+        Takes back the most recent move on the move stack, restoring only the squares it changed.
+        :return: True if a move was taken back, else False
+        """
+        if not self._move_stack:
+            return False
+        changes, self._turn, self._game_state = self._move_stack.pop()
+        self.undo_changes(changes)
+        self._positions = self._obj_board.set_positions()
+        return True
+
+    def undo_changes(self, changes):
+        """
+        Writes the prior values of changed squares back to the board, most recent change first.
+        :param changes: list of (row, column, prior value) tuples
+        :return: None
+        """
+        for row, col, val in reversed(changes):
+            self._obj_board.set_board(row, col, val)
+
     def get_coordinates(self, xy):
         """
         Uses input parameter to find row, column coordinates on game board.
@@ -161,26 +404,30 @@ class GessGame:
         :param tup: (row, column) tuple
         :return: list of board values (list of strings)
         """
-        row, col = tup
-        piece = [self._obj_board.get_board()[i][col-1:col+2] for i in range(row-1, row+2)]
-        return [item for sublist in piece for item in sublist]
+        black = self._obj_board.get_bitboard('B')
+        white = self._obj_board.get_bitboard('W')
+        return ['B' if black & bit else 'W' if white & bit else ' ' for bit in FOOTPRINT_BITS[tup]]
 
-    def legal_start(self, piece):
+    def legal_start(self, piece, player=None):
         """
         Checks all starting conditions to ensure piece is valid.
         :param piece: list of board values (strings)
+        :param player: 'BLACK' or 'WHITE' (string), defaults to the current player turn
         :return: True if start conditions and move are valid, else False.
         """
+        if player is None:
+            player = self._turn
+
         # Game has already been won.
         if self._game_state != 'UNFINISHED':
             return False
 
         # Invalid piece due to presence of opponent's stone or lack of
         # player's stone. Also catches incorrect player calling make_move.
-        if self._turn == 'BLACK':
+        if player == 'BLACK':
             if 'W' in piece or 'B' not in piece:
                 return False
-        if self._turn == 'WHITE':
+        if player == 'WHITE':
             if 'B' in piece or 'W' not in piece:
                 return False
 
@@ -194,27 +441,115 @@ class GessGame:
                 return False
         return True
 
+    def generate_moves(self, player=None):
+        """
+        Finds every legal move by sliding each of the player's pieces once along each direction
+        given by its stones, stopping where the leading edge first reaches a stone.
+        :param player: 'BLACK' or 'WHITE' (string), defaults to the current player turn
+        :return: list of (start, end) alphanumeric position tuples
+        """
+        if player is None:
+            player = self._turn
+        stone = player[0]
+        own = self._obj_board.get_bitboard(stone)
+        opponent = self._obj_board.get_bitboard('W' if stone == 'B' else 'B')
+        rings = self._obj_board.get_rings(stone)
+        moves = []
+
+        for tup, mask in FOOTPRINT_MASKS.items():
+
+            # Skips footprints with an opponent's stone or none of the player's stones.
+            if opponent & mask or not own & mask:
+                continue
+            piece = self.get_footprint(tup)
+            if self.legal_start(piece, player) is False:
+                continue
+            for tup2 in self.walk_rays(tup, piece, own, opponent, rings):
+                moves.append((LABELS[tup], LABELS[tup2]))
+        return moves
+
+    def legal_destinations(self, xy):
+        """
+        Finds every position the current player's piece may move to, walking once along each
+        direction given by its stones.
+        :param xy: center position of starting piece (string)
+        :return: list of alphanumeric end positions, empty if the piece may not move
+        """
+        tup = self.parse_position(xy)
+        if tup is False:
+            return []
+        piece = self.get_footprint(tup)
+        if self.legal_start(piece) is False:
+            return []
+        stone = self._turn[0]
+        own = self._obj_board.get_bitboard(stone)
+        opponent = self._obj_board.get_bitboard('W' if stone == 'B' else 'B')
+        rings = self._obj_board.get_rings(stone)
+        return [LABELS[tup2] for tup2 in self.walk_rays(tup, piece, own, opponent, rings)]
+
+    def walk_rays(self, tup, piece, own, opponent, rings):
+        """
+        Slides a piece along each direction given by its stones, stopping where the leading edge
+        first reaches a stone, and keeps the ends where the moving player still has a ring.
+        :param tup: (row, column) tuple of starting piece coordinates
+        :param piece: list of board values (list of strings), already checked by legal_start
+        :param own: bitboard of the moving player's stones (int)
+        :param opponent: bitboard of the opponent's stones (int)
+        :param rings: bitboard of the moving player's ring centers (int)
+        :return: list of (row, column) tuples of ending piece coordinates
+        """
+        occupied = own | opponent
+        ends = []
+        start = (tup[0]-1) * 20 + tup[1]
+
+        # If center position is blank, piece may only move up to 3 squares.
+        limit = 3 if piece[4] == ' ' else 17
+        for index, step in DIRECTION_STEPS.values():
+            if piece[index] == ' ':
+                continue
+            edges = LEADING_EDGES[index]
+            cell = start
+            for i in range(limit):
+                cell += step
+                edge = edges[cell]
+                if not edge:
+                    break
+                tup2 = CENTER_AT[cell]
+                if self.keeps_ring(tup, tup2, own, opponent, rings):
+                    ends.append(tup2)
+
+                # Piece may not slide past a stone in its leading edge.
+                if occupied & edge:
+                    break
+        return ends
+
+    def keeps_ring(self, tup, tup2, own, opponent, rings):
+        """
+        Determines whether the moving player still has a ring after a move, without changing the board.
+        :param tup: (row, column) tuple of starting piece coordinates
+        :param tup2: (row, column) tuple of ending piece coordinates
+        :param own: bitboard of the moving player's stones (int)
+        :param opponent: bitboard of the opponent's stones (int)
+        :param rings: bitboard of the moving player's ring centers (int)
+        :return: True if a ring remains, else False
+        """
+        # A ring away from both footprints is untouched by the move.
+        if rings & ~RING_REACH[tup] & ~RING_REACH[tup2]:
+            return True
+
+        # Moves the piece's stones on the bitboards and searches them for a ring.
+        start, end = FOOTPRINT_MASKS[tup], FOOTPRINT_MASKS[tup2]
+        piece = shift_bits(own & start, (tup2[0]-tup[0]) * 20 + tup2[1] - tup[1])
+        own = own & ~start & ~end | piece
+        return ring_centers(own, own | opponent & ~end) != 0
+
     def ring_present(self, player):
         """
-        Searches the game board for presence of a player's ring.
+        Checks the board's ring index for presence of a player's ring.
         :param player: 'B' or 'W' (string)
         :return: True if ring present, else False
         """
-        # Searches all empty board positions for a ring surrounding them.
-        for key, value in self._positions.items():
-            if value == ' ':
-                tup = self.get_coordinates(key)
-                if tup is False:
-                    continue
-                else:
-                    piece = self.get_footprint(tup)
-                    count = 0
-                    for i in piece:
-                        if i == player:
-                            count += 1
-                    if count == 8:
-                        return True
-        return False
+        return self._obj_board.get_rings(player) != 0
 
     def move_three(self, tup, tup2, piece):
         """
@@ -237,7 +572,7 @@ class GessGame:
     def legal_move(self, tup, tup2, piece):
         """
         Using stone positions on piece, determines direction of piece movement by start and end coordinates.
-        Once directional movement is obtained, uses helper functions to determine if move is unobstructed.
+        Once directional movement is obtained, checks the leading edge table to determine if move is unobstructed.
         :param tup: (row, column) tuple of starting piece coordinates
         :param tup2: (row, column) tuple of ending piece coordinates
         :param piece: list of board values (list of strings)
@@ -245,230 +580,25 @@ class GessGame:
         """
         row, col = tup
         row2, col2 = tup2
+        d_row, d_col = row2 - row, col2 - col
 
-        # Checks for stone position in NW coordinate.
-        if piece[0] != ' ':
-            if row2 in range(row-1, row-18, -1) and col2 in range(col-1, col-18, -1):
-                if self.move_nw(row, row2, col) is True:
-                    return True
-        # Checks for stone position in N coordinate.
-        if piece[1] != ' ':
-            if row2 in range(row-1, row-18, -1) and col2 in range(col, col+1):
-                if self.move_north(row, row2, col) is True:
-                    return True
-        # Checks for stone position in NE coordinate.
-        if piece[2] != ' ':
-            if row2 in range(row-1, row-18, -1) and col2 in range(col+1, col+18):
-                if self.move_ne(row, row2, col) is True:
-                    return True
-        # Checks for stone position in W coordinate.
-        if piece[3] != ' ':
-            if row2 in range(row, row+1) and col2 in range(col-1, col-18, -1):
-                if self.move_west(row, col, col2) is True:
-                    return True
-        # Checks for stone position in E coordinate.
-        if piece[5] != ' ':
-            if row2 in range(row, row+1) and col2 in range(col+1, col+18):
-                if self.move_east(row, col, col2) is True:
-                    return True
-        # Checks for stone position in SW coordinate.
-        if piece[6] != ' ':
-            if row2 in range(row+1, row+18) and col2 in range(col-1, col-18, -1):
-                if self.move_sw(row, row2, col) is True:
-                    return True
-        # Checks for stone position in S coordinate.
-        if piece[7] != ' ':
-            if row2 in range(row+1, row+18) and col2 in range(col, col+1):
-                if self.move_south(row, row2, col):
-                    return True
-        # Checks for stone position in SE coordinate.
-        if piece[8] != ' ':
-            if row2 in range(row+1, row+18) and col2 in range(col+1, col+18):
-                if self.move_se(row, row2, col) is True:
-                    return True
-        return False
-
-    def move_nw(self, row, row2, col):
-        """
-        Checks the leading edge of piece as it moves to determine if move is unobstructed.
-        :param row: starting row location of piece center (int)
-        :param row2: ending row location of piece center (int)
-        :param col: starting column location of piece center (int)
-        :return: True if move is valid, else False
-        """
-        row_move = row - row2
-        for i in range(row_move-1):
-
-            # Checks NW piece positions for stones.
-            if self._obj_board.get_board()[row-2-i][col-2-i] != ' ':
-                return False
-            # Checks N piece positions for stones.
-            if self._obj_board.get_board()[row-2-i][col-1-i] != ' ':
-                return False
-            # Checks NE piece positions for stones.
-            if self._obj_board.get_board()[row-2-i][col-i] != ' ':
-                return False
-            # Checks W piece positions for stones.
-            if self._obj_board.get_board()[row-1-i][col-2-i] != ' ':
-                return False
-            # Checks SW piece positions for stones.
-            if self._obj_board.get_board()[row-i][col-2-i] != ' ':
-                return False
-        return True
-
-    def move_north(self, row, row2, col):
-        """
-        Checks the leading edge of piece as it moves to determine if move is unobstructed.
-        :param row: starting row location of piece center (int)
-        :param row2: ending row location of piece center (int)
-        :param col: starting column location of piece center (int)
-        :return: True if move is valid, else False
-        """
-        for i in range(row-2, row2-1, -1):
-
-            # Checks NW, N, and NE piece positions for stones.
-            if self._obj_board.get_board()[i][col-1:col+2] != [' ', ' ', ' ']:
-                return False
-        return True
-
-    def move_ne(self, row, row2, col):
-        """
-        Checks the leading edge of piece as it moves to determine if move is unobstructed.
-        :param row: starting row location of piece center (int)
-        :param row2: ending row location of piece center (int)
-        :param col: starting column location of piece center (int)
-        :return: True if move is valid, else False
-        """
-        row_move = row - row2
-        for i in range(row_move-1):
-
-            # Checks NW piece positions for stones.
-            if self._obj_board.get_board()[row-2-i][col+i] != ' ':
-                return False
-            # Checks N piece positions for stones.
-            if self._obj_board.get_board()[row-2-i][col+1+i] != ' ':
-                return False
-            # Checks NE piece positions for stones.
-            if self._obj_board.get_board()[row-2-i][col+2+i] != ' ':
-                return False
-            # Checks E piece positions for stones.
-            if self._obj_board.get_board()[row-1-i][col+2+i] != ' ':
-                return False
-            # Checks SE piece positions for stones.
-            if self._obj_board.get_board()[row-i][col+2+i] != ' ':
-                return False
-        return True
-
-    def move_west(self, row, col, col2):
-        """
-        Checks the leading edge of piece as it moves to determine if move is unobstructed.
-        :param row: starting row location of piece center (int)
-        :param col: starting column location of piece center (int)
-        :param col2: ending column location of piece center (int)
-        :return: True if move is valid, else False
-        """
-        for i in range(col-2, col2, -1):
-
-            # Checks NW piece positions for stones.
-            if self._obj_board.get_board()[row-1][i] != ' ':
-                return False
-            # Checks W piece positions for stones.
-            if self._obj_board.get_board()[row][i] != ' ':
-                return False
-            # Checks SW piece positions for stones.
-            if self._obj_board.get_board()[row+1][i] != ' ':
-                return False
-        return True
-
-    def move_east(self, row, col, col2):
-        """
-        Checks the leading edge of piece as it moves to determine if move is unobstructed.
-        :param row: starting row location of piece center (int)
-        :param col: starting column location of piece center (int)
-        :param col2: ending column location of piece center (int)
-        :return: True if move is valid, else False
-        """
-        for i in range(col+2, col2+1):
-
-            # Checks NE piece positions for stones.
-            if self._obj_board.get_board()[row-1][i] != ' ':
-                return False
-            # Checks E piece positions for stones.
-            if self._obj_board.get_board()[row][i] != ' ':
-                return False
-            # Checks SE piece positions for stones.
-            if self._obj_board.get_board()[row+1][i] != ' ':
-                return False
-        return True
-
-    def move_sw(self, row, row2, col):
-        """
-        Checks the leading edge of piece as it moves to determine if move is unobstructed.
-        :param row: starting row location of piece center (int)
-        :param row2: ending row location of piece center (int)
-        :param col: starting column location of piece center (int)
-        :return: True if move is valid, else False
-        """
-        row_move = row2 - row
-        for i in range(row_move-1):
-
-            # Checks SW piece positions for stones.
-            if self._obj_board.get_board()[row+2+i][col-2-i] != ' ':
-                return False
-            # Checks S piece positions for stones.
-            if self._obj_board.get_board()[row+2+i][col-1-i] != ' ':
-                return False
-            # Checks SE piece positions for stones.
-            if self._obj_board.get_board()[row+2+i][col-i] != ' ':
-                return False
-            # Checks W piece positions for stones.
-            if self._obj_board.get_board()[row+1+i][col-2-i] != ' ':
-                return False
-            # Checks NW piece positions for stones.
-            if self._obj_board.get_board()[row+i][col-2-i] != ' ':
-                return False
-        return True
-
-    def move_south(self, row, row2, col):
-        """
-        Checks the leading edge of piece as it moves to determine if move is unobstructed.
-        :param row: starting row location of piece center (int)
-        :param row2: ending row location of piece center (int)
-        :param col: starting column location of piece center (int)
-        :return: True if move is valid, else False
-        """
-        for i in range(row+2, row2+1):
-
-            # Checks SW, S, and SE piece positions for stones.
-            if self._obj_board.get_board()[i][col-1: col+2] != [' ', ' ', ' ']:
-                return False
-        return True
+        # Moves must stay on a row, column, or diagonal.
+        if d_row and d_col and abs(d_row) != abs(d_col):
+            return False
 
-    def move_se(self, row, row2, col):
-        """
-        Checks the leading edge of piece as it moves to determine if move is unobstructed.
-        :param row: starting row location of piece center (int)
-        :param row2: ending row location of piece center (int)
-        :param col: starting column location of piece center (int)
-        :return: True if move is valid, else False
-        """
-        row_move = row2 - row
-        for i in range(row_move-1):
+        # Checks for a stone in the footprint position pointing in the direction of movement.
+        direction = DIRECTION_STEPS.get(((d_row > 0) - (d_row < 0), (d_col > 0) - (d_col < 0)))
+        if direction is None or piece[direction[0]] == ' ':
+            return False
 
-            # Checks NE piece positions for stones.
-            if self._obj_board.get_board()[row+i][col+2+i] != ' ':
-                return False
-            # Checks SE piece positions for stones.
-            if self._obj_board.get_board()[row+2+i][col+2+i] != ' ':
-                return False
-            # Checks S piece positions for stones.
-            if self._obj_board.get_board()[row+2+i][col+1+i] != ' ':
-                return False
-            # Checks SW piece positions for stones.
-            if self._obj_board.get_board()[row+2+i][col+i] != ' ':
-                return False
-            # Checks E piece positions for stones.
-            if self._obj_board.get_board()[row+1+i][col+2+i] != ' ':
+        # Checks each leading edge before the last step, stopping at the first stone.
+        index, step = direction
+        edges = LEADING_EDGES[index]
+        occupied = self._obj_board.get_occupied()
+        cell = (row-1) * 20 + col
+        for i in range(max(abs(d_row), abs(d_col)) - 1):
+            cell += step
+            if occupied & edges[cell]:
                 return False
         return True
 
@@ -498,24 +628,19 @@ class GessGame:
         self._obj_board.set_board(row+1, col, piece[7])
         # Updates SE position
         self._obj_board.set_board(row+1, col+1, piece[8])
-        # Updates positions dictionary
-        self._positions = self._obj_board.set_positions()
 
     def del_edges(self):
         """
         Removes any stones from the board edges.
         :return: None
         """
-        # Deletes stones in the top and bottom rows.
-        for n in range(20):
-            self._obj_board.set_board(1, n, " ")
-            self._obj_board.set_board(20, n, " ")
-        # Deletes stones in the A and T columns.
-        for n in range(1, 21):
-            self._obj_board.set_board(n, 0, " ")
-            self._obj_board.set_board(n, 19, " ")
-        # Updates positions dictionary
-        self._positions = self._obj_board.set_positions()
+        # Deletes only the stones in the top and bottom rows and the A and T columns.
+        edges = self._obj_board.get_occupied() & EDGE_MASK
+        while edges:
+            bit = edges & -edges
+            edges ^= bit
+            row, col = divmod(bit.bit_length()-1, 20)
+            self._obj_board.set_board(row+1, col, " ")
 
 
 class GessBoard:
@@ -526,7 +651,8 @@ class GessBoard:
     def __init__(self):
         """
         Initializes the game board, all 86 stone positions, alphabetizes game board
-        column headers, creates a dictionary to track all game board positions.
+        column headers, creates a dictionary to track all game board positions and
+        a bitboard of each player's stones.
         """
         self._board = [
             [' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' '],
@@ -553,6 +679,26 @@ class GessBoard:
         self._column_header = [chr(x) for x in range(ord('A'), ord('U'))]
         self._alpha_num_dict = dict(zip(self._column_header, [x for x in range(0, 20)]))
         self._positions = {}
+        self._dirty = set()
+        self._changes = None
+
+        # Mirrors the board as one bitboard per player for fast footprint and ring checks.
+        self._bitboards = {'B': 0, 'W': 0}
+        for row in range(1, 21):
+            for col in range(20):
+                if self._board[row][col] != ' ':
+                    self._bitboards[self._board[row][col]] |= cell_bit(row, col)
+
+        # Zobrist hash of the stones on the board, updated by set_board.
+        self._hash = 0
+        for row in range(1, 21):
+            for col in range(20):
+                if self._board[row][col] != ' ':
+                    self._hash ^= ZOBRIST[self._board[row][col]][(row-1) * 20 + col]
+
+        # Ring centers per player, rechecked only around squares changed since the last lookup.
+        self._rings = {'B': 0, 'W': 0}
+        self._ring_dirty = EDGE_MASK | CENTER_MASK
 
     def get_board(self):
         """
@@ -560,6 +706,53 @@ class GessBoard:
         """
         return self._board
 
+    def get_bitboard(self, player):
+        """
+        :param player: 'B' or 'W' (string)
+        :return: bitboard of the player's stones (int)
+        """
+        return self._bitboards[player]
+
+    def get_occupied(self):
+        """
+        :return: bitboard of all stones on the board (int)
+        """
+        return self._bitboards['B'] | self._bitboards['W']
+
+    def get_hash(self):
+        """
+        :return: 64-bit Zobrist hash of the stones on the board (int)
+        """
+        return self._hash
+
+    def get_rings(self, player):
+        """
+        :param player: 'B' or 'W' (string)
+        :return: bitboard of the player's ring centers (int)
+        """
+        if self._ring_dirty:
+            self.update_rings()
+        return self._rings[player]
+
+    def update_rings(self):
+        """
+        Rechecks the ring centers within one square of any square changed since the last update,
+        using one shift-and pass over the board per player.
+        :return: None
+        """
+        # Spreads the changed squares to their neighbors. Shifts that wrap around a row
+        # only reach columns A and T, which never hold a ring center.
+        region = self._ring_dirty
+        region |= region << 1 | region >> 1
+        region |= region << 20 | region >> 20
+        region &= CENTER_MASK
+        self._ring_dirty = 0
+
+        black, white = self._bitboards['B'], self._bitboards['W']
+        occupied = black | white
+        self._rings['B'] = self._rings['B'] & ~region | ring_centers(black, occupied) & region
+        self._rings['W'] = self._rings['W'] & ~region | ring_centers(white, occupied) & region
+
     def get_positions(self):
         """
         :return: self._positions (dictionary)
@@ -574,32 +767,57 @@ class GessBoard:
         :param val: 'B', 'W', or ' ' (string)
         :return: None
         """
+        old = self._board[row][col]
+        if old == val:
+            return
         self._board[row][col] = val
 
+        # Keeps the bitboards and hash in step with the board.
+        index = (row-1) * 20 + col
+        bit = 1 << index
+        if old != ' ':
+            self._bitboards[old] ^= bit
+            self._hash ^= ZOBRIST[old][index]
+        if val != ' ':
+            self._bitboards[val] |= bit
+            self._hash ^= ZOBRIST[val][index]
+        self._ring_dirty |= bit
+        self._dirty.add((row, col))
+        if self._changes is not None:
+            self._changes.append((row, col, old))
+
+    def begin_changes(self):
+        """
+        Starts recording each square changed by set_board along with its prior value.
+        :return: None
+        """
+        self._changes = []
+
+    def end_changes(self):
+        """
+        Stops recording changed squares.
+        :return: list of (row, column, prior value) tuples in the order they changed
+        """
+        changes, self._changes = self._changes, None
+        return changes
+
     def set_positions(self):
         """
         Adds all board positions to the dictionary. Keys are labeled by alphanumeric position
         on the game board ('A2'), values are "B", "W", or " " to indicate presence of player's stones.
+        After the first call, only positions changed by set_board since the last call are updated.
         :return: self._positions (dictionary)
         """
-        count = -1
-        # Iterates through game board rows, keeping track of row position.
-        for row in self._board:
-            count += 1
-            for i in range(len(row)):
-
-                # Skips row 0 to begin tracking positions at row 1.
-                if count == 0:
-                    continue
-                else:
-                    # Finds the alphabet letter corresponding to the column index.
-                    for key, value in self._alpha_num_dict.items():
-                        if i == value:
-                            # Labels stone position: alphabet column header + row index.
-                            position = key+str(count)
-
-                            # Adds the board position to the dictionary.
-                            self._positions[position] = self._board[count][value]
+        # Fills the dictionary on first use, beginning at row 1.
+        if not self._positions:
+            for (row, col), position in LABELS.items():
+                self._positions[position] = self._board[row][col]
+
+        # Updates only the positions that changed since the last call.
+        else:
+            for row, col in self._dirty:
+                self._positions[LABELS[(row, col)]] = self._board[row][col]
+        self._dirty.clear()
         return self._positions
 
     def print_board(self):
@@ -607,36 +825,21 @@ class GessBoard:
         Uses ANSI Escape Sequences to print a colorful game board.
         :return: None
         """
-        # Enables ANSI Escape Sequences to operate on Windows 10.
-        # import os
-        # os.system("")
+        # Loads the terminal renderer only when a board is printed.
+        from gess_terminal import print_board
+        print_board(self._board, self._column_header)
 
-        # Provides spacing for column header alignment and prints column headers.
-        print("  ", end=' ')
-        for i in self._column_header:
-            print('\u001b[4m\u001b[1m\u001b[95m', i + ' ', end="")
 
-        print('\033[04m\033[35m')
-        for i in range(1, 21):
+def validate_moves(moves):
+    """
+    Replays a recorded game from the initial layout with GessGame.apply_moves.
+    :param moves: sequence of (start, end) center position pairs (strings)
+    :return: index of the first illegal move, or None if every move is legal
+    """
+    moves = list(moves)
+    count = GessGame().apply_moves(moves)
+    return None if count == len(moves) else count
 
-            # Assists with alignment for single and double digit row numbers.
-            if i < 10:
-                print('\u001b[4m\u001b[95m' + str(i) + '\033[35m', '', end=" ")
-            else:
-                print('\u001b[4m\u001b[95m' + str(i) + '\033[35m', end=" ")
-
-            # Creates columns to complete game board.
-            for j in range(20):
-                if self._board[i][j] == 'B':
-                    print(u'\u2502\u001b[34;1m'+self._board[i][j]+'\u001b[35m', end=' ')
-                elif self._board[i][j] == 'W':
-                    print(u'\u2502\u001b[30;1m'+self._board[i][j]+'\u001b[35m', end=' ')
-                else:
-                    print(u'\u2502' + self._board[i][j], end=' ')
-            print(u'\u2502')
-        print('\033[00m')
-
-game = GessGame()
-board = GessBoard()
-# print(game.make_move("d7", 'c7'))
-print(game.print_board())
+
+if __name__ == '__main__':
+    GessGame().print_board()
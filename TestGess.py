@@ -2,9 +2,39 @@
 # Date: 6/4/2020
 # Description: CS 162, Portfolio Project Test File
 
-from GessGame import GessGame, GessBoard
+from GessGame import GessGame, GessBoard, cell_bit, ZOBRIST, FOOTPRINT_MASKS, validate_moves
+from gess_transposition import TranspositionTable, EXACT, LOWER
+from gess_engine import GessEngine, WIN_SCORE, score_to_table, score_from_table
+from gess_mcts import MCTSPlayer
+from gess_protocol import EngineProtocol
+from gess_server import GessServer, encode_frame, read_frame
+from gess_state import GessState, footprint
+from gess_terminal import TerminalView, CELL_STYLE
+from gess_selfplay import run as run_selfplay
+import gess_tournament
+from gess_book import OpeningBook, count_moves, write_book
+from gess_records import RecordArchive, read_records, write_records, encode_move, decode_move, MOVES, MOVE_CODES
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import io
+import os
+import pickle
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
 
+# NumPy is optional; its tests are skipped without it.
+try:
+    import numpy
+    import gess_eval
+    import gess_env
+except ImportError:
+    numpy = None
+
 
 class GessGameTester(unittest.TestCase):
     """
@@ -175,4 +205,795 @@ class GessGameTester(unittest.TestCase):
         self.game.make_move('l9', 'l10')
         self.assertTrue(self.game.make_move('l13', 'l12'))
         self.assertEqual(self.game.get_game_state(), 'WHITE_WON')
-        self.assertFalse(self.game.make_move('c3', 'c5'))
\ No newline at end of file
+        self.assertFalse(self.game.make_move('c3', 'c5'))
+
+    def test_slide_rules(self):
+        """
+        Tests that diagonal moves stay on the diagonal and that a westward slide stops at the first stone.
+        """
+        self.assertFalse(self.game.make_move('c2', 'g3'))
+        self.assertFalse(self.game.make_move('i4', 'g4'))
+        self.assertTrue(self.game.make_move('i4', 'h4'))
+
+    def test_bitboards(self):
+        """
+        Tests that the bitboards stay in step with the game board as stones move and are captured.
+        """
+        moves = [('c3', 'c5'), ('c18', 'C16'), ('r3', 's3'), ('R18', 's18'), ('l8', 'l6'), ('l13', 'L15')]
+        for xy, xy2 in moves:
+            self.assertTrue(self.game.make_move(xy, xy2))
+            board = self.game.get_board()
+            for player in ('B', 'W'):
+                bits = 0
+                for row in range(1, 21):
+                    for col in range(20):
+                        if board[row][col] == player:
+                            bits |= cell_bit(row, col)
+                self.assertEqual(self.game._obj_board.get_bitboard(player), bits)
+
+    def test_ring_index(self):
+        """
+        Tests that the incremental ring index matches a full scan of the board as rings are destroyed.
+        """
+        moves = [('m7', 'k7'), ('m14', 'k14'), ('l3', 'l6'), ('l18', 'l15'), ('l6', 'l9'), ('l15', 'l13'),
+                 ('l9', 'l10'), ('l13', 'l12')]
+        for xy, xy2 in moves:
+            self.assertTrue(self.game.make_move(xy, xy2))
+            board = self.game.get_board()
+            for player in ('B', 'W'):
+                centers = set()
+                for row in range(2, 20):
+                    for col in range(1, 19):
+                        if board[row][col] == ' ' and self.game.get_footprint((row, col)).count(player) == 8:
+                            centers.add(cell_bit(row, col))
+                self.assertEqual(self.game._obj_board.get_rings(player), sum(centers))
+        self.assertEqual(self.game._obj_board.get_rings('B'), 0)
+
+    def test_positions_after_revert(self):
+        """
+        Tests that the positions dict matches the board after a move that would destroy the player's own ring.
+        """
+        self.assertFalse(self.game.make_move('n3', 'm3'))
+        for i in range(1, 21):
+            for j in range(20):
+                self.assertEqual(self.game._positions[chr(ord('A')+j)+str(i)], self.game.get_board()[i][j])
+
+    def test_generate_moves(self):
+        """
+        Tests that generate_moves returns exactly the moves make_move accepts, and none once the game is won.
+        """
+        self.game.make_move('c3', 'c5')
+        self.game.make_move('r18', 'r15')
+        moves = self.game.generate_moves()
+        self.assertEqual(len(moves), len(set(moves)))
+
+        labels = [chr(ord('A')+j)+str(i) for i in range(2, 20) for j in range(1, 19)]
+        accepted = []
+        for xy in labels:
+            for xy2 in labels:
+                if self.game.make_move(xy, xy2):
+                    accepted.append((xy, xy2))
+                    self.game = GessGame()
+                    self.game.make_move('c3', 'c5')
+                    self.game.make_move('r18', 'r15')
+        self.assertEqual(sorted(moves), sorted(accepted))
+
+        for xy, xy2 in [('m7', 'k7'), ('m14', 'K14'), ('l3', 'l6'), ('l18', 'l15'), ('l6', 'l9'),
+                        ('l15', 'l13'), ('L9', 'l11')]:
+            self.game.make_move(xy, xy2)
+        self.assertEqual(self.game.generate_moves(), [])
+
+    def test_push_pop(self):
+        """
+        Tests that pop_move restores the board, positions, rings, turn, and game state after each move.
+        """
+        moves = [('c3', 'b3'), ('c18', 'b18'), ('f3', 'c6'), ('F18', 'c15'), ('m7', 'k7'), ('m14', 'K14'),
+                 ('l3', 'l6'), ('l18', 'l15'), ('l6', 'l9'), ('l15', 'l13'), ('L9', 'l11')]
+        snapshots = []
+        for xy, xy2 in moves:
+            snapshots.append(([row[:] for row in self.game.get_board()], dict(self.game._positions),
+                              self.game._obj_board.get_rings('B'), self.game._obj_board.get_rings('W'),
+                              self.game.get_turn(), self.game.get_game_state()))
+            self.assertTrue(self.game.push_move(xy, xy2))
+        self.assertEqual(self.game.get_game_state(), 'BLACK_WON')
+        self.assertFalse(self.game.push_move('c18', 'c16'))
+
+        for snapshot in reversed(snapshots):
+            self.assertTrue(self.game.pop_move())
+            self.assertEqual((self.game.get_board(), self.game._positions,
+                              self.game._obj_board.get_rings('B'), self.game._obj_board.get_rings('W'),
+                              self.game.get_turn(), self.game.get_game_state()), snapshot)
+        self.assertFalse(self.game.pop_move())
+
+    def test_make_move_unrecorded(self):
+        """
+        Tests that make_move and apply_moves keep no undo history, and clear what push_move left.
+        """
+        self.assertTrue(self.game.push_move('c3', 'c5'))
+        self.assertTrue(self.game.make_move('c18', 'c16'))
+        self.assertFalse(self.game.pop_move())
+        self.assertEqual(self.game.apply_moves([('r3', 's3'), ('r18', 's18')]), 2)
+        self.assertEqual(self.game._move_stack, [])
+        self.assertTrue(self.game.push_move('c5', 'c6'))
+        self.assertTrue(self.game.pop_move())
+        self.assertEqual(self.game.get_board()[5][2], 'B')
+
+    def test_hash(self):
+        """
+        Tests that the Zobrist hash matches the stones on the board, depends on move order only
+        through the resulting position, and is restored by pop_move.
+        """
+        start = self.game.get_hash()
+        self.game.push_move('c3', 'c5')
+        self.game.push_move('c18', 'c16')
+        self.game.push_move('r3', 's3')
+        self.assertNotEqual(self.game.get_hash(), start)
+
+        expected = 0
+        board = self.game.get_board()
+        for row in range(1, 21):
+            for col in range(20):
+                if board[row][col] != ' ':
+                    expected ^= ZOBRIST[board[row][col]][(row-1) * 20 + col]
+        self.assertEqual(self.game._obj_board.get_hash(), expected)
+
+        other = GessGame()
+        other.make_move('r3', 's3')
+        other.make_move('c18', 'c16')
+        other.make_move('c3', 'c5')
+        self.assertEqual(other.get_hash(), self.game.get_hash())
+
+        for i in range(3):
+            self.game.pop_move()
+        self.assertEqual(self.game.get_hash(), start)
+
+    def test_headless_import(self):
+        """
+        Tests that importing the rules engine prints nothing and loads no rendering modules.
+        """
+        code = 'import sys, GessGame; print(sorted(set(sys.modules) & {"gess_terminal", "pygame"}))'
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        self.assertEqual(output, '[]\n')
+
+    def test_legal_move_table(self):
+        """
+        Tests leading edge table lookups against footprints compared step by step.
+        """
+        game = GessGame()
+        for xy, xy2 in (('c3', 'b3'), ('c18', 'b18'), ('f3', 'c6'), ('F18', 'c15'), ('f8', 'f5'), ('f13', 'f15')):
+            self.assertTrue(game.make_move(xy, xy2))
+        occupied = game.get_bitboard('B') | game.get_bitboard('W')
+        for tup in FOOTPRINT_MASKS:
+            piece = game.get_footprint(tup)
+            for index, d_row, d_col in ((0, -1, -1), (1, -1, 0), (2, -1, 1), (3, 0, -1),
+                                        (5, 0, 1), (6, 1, -1), (7, 1, 0), (8, 1, 1)):
+                clear = piece[index] != ' '
+                prior = tup
+                for distance in range(1, 18):
+                    tup2 = (tup[0] + d_row * distance, tup[1] + d_col * distance)
+                    if tup2 not in FOOTPRINT_MASKS:
+                        break
+                    self.assertEqual(game.legal_move(tup, tup2, piece), clear, (tup, tup2))
+                    if occupied & FOOTPRINT_MASKS[tup2] & ~FOOTPRINT_MASKS[prior]:
+                        clear = False
+                    prior = tup2
+            self.assertFalse(game.legal_move(tup, (tup[0] + 1, tup[1] + 2), piece))
+
+    def test_apply_moves(self):
+        """
+        Tests that a batch of moves matches making them one at a time and stops at the first illegal move.
+        """
+        moves = [('c3', 'b3'), ('c18', 'b18'), ('f3', 'C6'), ('F18', 'c15'), ('f8', 'f5'), ('f13', 'f15'),
+                 ('c6', 'e08')]
+        game = GessGame()
+        self.assertEqual(game.apply_moves(moves[:6]), 6)
+        for xy, xy2 in moves[:6]:
+            self.assertTrue(self.game.make_move(xy, xy2))
+        self.assertEqual(game.get_hash(), self.game.get_hash())
+        self.assertEqual(game._positions, self.game._positions)
+
+        # Stops before the move from an empty footprint, leaving the state after the legal move.
+        self.assertEqual(game.apply_moves([('c6', 'e8'), ('j10', 'j11'), ('c15', 'c16')]), 1)
+        self.assertEqual(game.get_turn(), 'WHITE')
+        self.assertEqual(game._positions['E8'], 'B')
+        self.assertEqual(validate_moves(moves), None)
+        self.assertEqual(validate_moves(moves[:2] + [('', 'c5')] + moves[2:]), 2)
+        self.assertEqual(validate_moves([('c3', 'z9')]), 0)
+        self.assertEqual(validate_moves([]), None)
+
+    def test_legal_destinations(self):
+        """
+        Tests that a piece's destinations match the generated moves starting from it.
+        """
+        game = GessGame()
+        game.make_move('c3', 'c6')
+        moves = game.generate_moves()
+        for xy in ('R18', 'c18', 'K18', 'J10'):
+            expected = sorted(xy2 for start, xy2 in moves if start == xy.upper())
+            self.assertEqual(sorted(game.legal_destinations(xy)), expected)
+        self.assertIn('R15', game.legal_destinations('r18'))
+        self.assertEqual(game.legal_destinations('J10'), [])
+        self.assertEqual(game.legal_destinations('C6'), [])
+        self.assertEqual(game.legal_destinations(''), [])
+        for xy in ('z99', 'a1', 't20', 'c', '3c'):
+            self.assertEqual(game.legal_destinations(xy), [])
+
+
+class TranspositionTableTester(unittest.TestCase):
+    """
+    Contains unit tests for the gess_transposition file.
+    """
+    def test_store_probe(self):
+        """
+        Tests storing, probing, and the depth-preferred replacement policy.
+        """
+        table = TranspositionTable(1000)
+        self.assertEqual(table.get_size(), 512)
+        self.assertIsNone(table.probe(7))
+        self.assertTrue(table.store(7, 3, 10, EXACT, ('C3', 'C5')))
+        self.assertEqual(table.probe(7), (3, 10, EXACT, ('C3', 'C5')))
+
+        # A shallower result for a colliding position does not replace a deeper one.
+        self.assertFalse(table.store(7 + 512, 2, 5))
+        self.assertEqual(table.probe(7 + 512), None)
+
+        # The same position keeps its best move when a new result has none.
+        self.assertTrue(table.store(7, 1, 4, LOWER))
+        self.assertEqual(table.probe(7), (1, 4, LOWER, ('C3', 'C5')))
+
+        # Entries from an earlier search are always replaced.
+        table.store(9, 8, 1)
+        table.new_search()
+        self.assertTrue(table.store(9 + 512, 1, 2))
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.get_hit_rate(), 0.5)
+
+
+class GessEngineTester(unittest.TestCase):
+    """
+    Contains unit tests for the gess_engine file.
+    """
+    def test_search(self):
+        """
+        Tests that the engine returns a legal move, reports its statistics, and leaves the game unchanged.
+        """
+        game = GessGame()
+        start = game.get_hash()
+        engine = GessEngine()
+        reports = []
+        move = engine.search(game, movetime=10000, max_depth=1, info=reports.append)
+        self.assertIn(move, game.generate_moves())
+        self.assertEqual(game.get_hash(), start)
+        self.assertEqual(engine.get_depth(), 1)
+        self.assertGreater(engine.get_nodes(), 0)
+        self.assertEqual(reports[0]['depth'], 1)
+        self.assertEqual(reports[0]['pv'], [move])
+
+    def test_winning_move(self):
+        """
+        Tests that the engine finds a move destroying the opponent's last ring.
+        """
+        game = GessGame()
+        for xy, xy2 in [('m7', 'k7'), ('m14', 'K14'), ('l3', 'l6'), ('l18', 'l15'), ('l6', 'l9'), ('l15', 'l13')]:
+            game.make_move(xy, xy2)
+        engine = GessEngine(movetime=10000, max_depth=2)
+        game.make_move(*engine.choose_move(game))
+        self.assertEqual(game.get_game_state(), 'BLACK_WON')
+
+    def test_movetime(self):
+        """
+        Tests that the engine returns its move close to its time budget.
+        """
+        game = GessGame()
+        engine = GessEngine(movetime=50)
+        start = time.monotonic()
+        self.assertIn(engine.choose_move(game), game.generate_moves())
+        self.assertLess(time.monotonic() - start, 0.1)
+
+    def test_table_win_scores(self):
+        """
+        Tests that wins and losses are stored counted from their position and read back counted from the root.
+        """
+        self.assertEqual(score_to_table(WIN_SCORE - 5, 3), WIN_SCORE - 2)
+        self.assertEqual(score_from_table(WIN_SCORE - 2, 1), WIN_SCORE - 3)
+        self.assertEqual(score_to_table(-WIN_SCORE + 4, 4), -WIN_SCORE)
+        self.assertEqual(score_from_table(-WIN_SCORE, 2), -WIN_SCORE + 2)
+        self.assertEqual(score_to_table(150, 6), 150)
+        self.assertEqual(score_from_table(-150, 6), -150)
+
+
+class MCTSPlayerTester(unittest.TestCase):
+    """
+    Contains unit tests for the gess_mcts file.
+    """
+    def test_search(self):
+        """
+        Tests that searches in one or more processes return a legal move, merge every playout
+        into the root visit counts, and leave the game unchanged.
+        """
+        game = GessGame()
+        start = game.get_hash()
+        for workers in (1, 2):
+            player = MCTSPlayer(workers=workers, seed=1)
+            move = player.search(game, iterations=20)
+            player.close()
+            self.assertIn(move, game.generate_moves())
+            self.assertEqual(player.get_playouts(), 20 * workers)
+            self.assertEqual(sum(player.get_visits().values()), 20 * workers)
+            self.assertEqual(game.get_hash(), start)
+
+
+class EngineProtocolTester(unittest.TestCase):
+    """
+    Contains unit tests for the gess_protocol file.
+    """
+    def test_commands(self):
+        """
+        Tests position setup, move listing, searching, and reporting of bad input.
+        """
+        output = io.StringIO()
+        protocol = EngineProtocol(output=output)
+        protocol.run(io.StringIO('gess\nisready\nposition startpos moves c3-c5 R18-R15\nmoves\n'
+                                 'position startpos moves c3-z9\nfly\n'))
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[:3], ['id name GessEngine', 'gessok', 'readyok'])
+        self.assertIn('C6-C13', lines[3].split())
+        self.assertEqual(len(lines[3].split()), 324)
+        self.assertEqual(lines[4:], ['info string illegal move c3-z9', 'info string unknown command fly'])
+
+        protocol.handle('go depth 1')
+        protocol.wait()
+        lines = output.getvalue().splitlines()
+        self.assertTrue(lines[-3].startswith('info depth 1 score'))
+        self.assertTrue(lines[-2].startswith('info nodes'))
+        self.assertEqual(lines[-1], 'bestmove ' + lines[-3].split(' pv ')[1])
+
+    def test_stop(self):
+        """
+        Tests that a stop sent immediately after an infinite search starts always ends the search.
+        """
+        output = io.StringIO()
+        protocol = EngineProtocol(output=output)
+
+        def searches():
+            for i in range(50):
+                protocol.handle('go infinite')
+                protocol.handle('stop')
+        thread = threading.Thread(target=searches, daemon=True)
+        thread.start()
+        thread.join(60)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(sum(line.startswith('bestmove') for line in output.getvalue().splitlines()), 50)
+
+    def test_commands_during_search(self):
+        """
+        Tests that commands changing the position end an infinite search instead of waiting for it.
+        """
+        output = io.StringIO()
+        protocol = EngineProtocol(output=output)
+        commands = io.StringIO('go infinite\nposition startpos\ngo infinite\nmoves\ngo infinite\nnewgame\n'
+                               'go infinite\nstop\nquit\n')
+        thread = threading.Thread(target=protocol.run, args=(commands,), daemon=True)
+        thread.start()
+        thread.join(60)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(sum(line.startswith('bestmove') for line in output.getvalue().splitlines()), 4)
+
+
+class GessServerTester(unittest.TestCase):
+    """
+    Contains unit tests for the gess_server file.
+    """
+    def test_session(self):
+        """
+        Tests creating, playing, and closing a game over a connection, and error responses.
+        """
+        async def session():
+            server = GessServer()
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+            async def request(message):
+                writer.write(encode_frame(message))
+                await writer.drain()
+                return await read_frame(reader)
+
+            game = (await request({'op': 'new', 'id': 7}))
+            self.assertEqual(game['id'], 7)
+            game_id = game['game']
+            self.assertEqual(await request({'op': 'move', 'game': game_id, 'start': 'c3', 'end': 'c5'}),
+                             {'ok': True, 'turn': 'WHITE', 'state': 'UNFINISHED'})
+            self.assertFalse((await request({'op': 'move', 'game': game_id, 'start': 'c5', 'end': 'c6'}))['ok'])
+            self.assertFalse((await request({'op': 'move', 'game': game_id, 'start': 'r18'}))['ok'])
+            self.assertEqual(len((await request({'op': 'moves', 'game': game_id}))['moves']), 322)
+            state = await request({'op': 'state', 'game': game_id})
+            self.assertEqual(len(state['board']), 20)
+            self.assertEqual(state['board'][5][2], 'B')
+            self.assertEqual(server.get_move_count(), 1)
+            self.assertEqual(server.get_session_count(), 1)
+
+            self.assertTrue((await request({'op': 'close', 'game': game_id}))['ok'])
+            self.assertEqual(await request({'op': 'state', 'game': game_id}), {'ok': False, 'error': 'no such game'})
+            self.assertEqual(await request({'op': 'fly', 'game': [1]}), {'ok': False, 'error': 'no such game'})
+            self.assertEqual(server.get_session_count(), 0)
+
+            # Lets the handler read the end of the stream and close its side before shutting down.
+            writer.write_eof()
+            self.assertIsNone(await read_frame(reader))
+            writer.close()
+            await writer.wait_closed()
+            listener.close()
+            await listener.wait_closed()
+
+        asyncio.run(session())
+
+    def test_disconnect(self):
+        """
+        Tests that games left open by a connection are dropped when it ends.
+        """
+        async def session():
+            server = GessServer(max_sessions=3)
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            for i in range(4):
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(encode_frame({'op': 'new'}) + encode_frame({'op': 'new'}))
+                await writer.drain()
+                self.assertTrue((await read_frame(reader))['ok'])
+                self.assertTrue((await read_frame(reader))['ok'])
+                writer.close()
+                await writer.wait_closed()
+                for j in range(100):
+                    if server.get_session_count() == 0:
+                        break
+                    await asyncio.sleep(0.01)
+                self.assertEqual(server.get_session_count(), 0)
+            listener.close()
+            await listener.wait_closed()
+
+        asyncio.run(session())
+
+    def test_moves_off_loop(self):
+        """
+        Tests that a connection waiting on a move list does not hold back others, and that move lists are cached.
+        """
+        async def session():
+            release = threading.Event()
+            with ThreadPoolExecutor(1) as executor:
+                server = GessServer(executor=executor)
+                listener = await server.start(port=0)
+                port = listener.sockets[0].getsockname()[1]
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                reader2, writer2 = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(encode_frame({'op': 'new'}))
+                game_id = (await read_frame(reader))['game']
+
+                # Occupies the executor so the move list waits behind it.
+                executor.submit(release.wait, 10)
+                writer.write(encode_frame({'op': 'moves', 'game': game_id}))
+                await writer.drain()
+                writer2.write(encode_frame({'op': 'state', 'game': game_id}))
+                self.assertTrue((await asyncio.wait_for(read_frame(reader2), 5))['ok'])
+                release.set()
+                moves = (await read_frame(reader))['moves']
+                self.assertEqual(len(moves), 322)
+
+                writer2.write(encode_frame({'op': 'moves', 'game': game_id}))
+                self.assertEqual((await read_frame(reader2))['moves'], moves)
+                writer2.write(encode_frame({'op': 'move', 'game': game_id, 'start': 'c3', 'end': 'c5'}))
+                await read_frame(reader2)
+                writer2.write(encode_frame({'op': 'moves', 'game': game_id}))
+                self.assertNotEqual((await read_frame(reader2))['moves'], moves)
+
+                for stream in (writer, writer2):
+                    stream.close()
+                    await stream.wait_closed()
+                listener.close()
+                await listener.wait_closed()
+
+        asyncio.run(session())
+
+
+class GessStateTester(unittest.TestCase):
+    """
+    Contains unit tests for the gess_state file.
+    """
+    def test_round_trip(self):
+        """
+        Tests that a packed game matches the original through the adapters and restores to an equal game.
+        """
+        game = GessGame()
+        game.make_move('c3', 'c5')
+        game.make_move('r18', 'r15')
+        state = GessState(game)
+        self.assertEqual(len(state.get_cells()), 400)
+        self.assertEqual(state.get_board(), game.get_board())
+        self.assertEqual(state.get_positions(), game._obj_board.get_positions())
+        self.assertEqual(state.get_bitboard('W'), game.get_bitboard('W'))
+        self.assertEqual(state.get_turn(), 'BLACK')
+        self.assertEqual(state.get_game_state(), 'UNFINISHED')
+
+        restored = state.to_game()
+        self.assertEqual(restored.get_hash(), game.get_hash())
+        self.assertEqual(restored.generate_moves(), game.generate_moves())
+        self.assertTrue(restored.make_move('c5', 'c6'))
+        self.assertFalse(hasattr(state, '__dict__'))
+        self.assertLess(footprint(lambda: GessState(game), 100), 1000)
+
+
+class TerminalViewTester(unittest.TestCase):
+    """
+    Contains unit tests for the gess_terminal file.
+    """
+    def test_live_updates(self):
+        """
+        Tests that the first frame draws the whole board and later frames rewrite only changed squares.
+        """
+        game = GessGame()
+        output = io.StringIO()
+        view = TerminalView(output=output)
+        view.draw(game.get_board(), 'BLACK to move')
+        first = output.getvalue()
+        self.assertTrue(first.startswith('\033[H\033[2J'))
+        self.assertEqual(first.count('B\u001b[35m'), 86 // 2)
+
+        # Moving c3 to c4 changes six squares between rows 2 and 5.
+        game.make_move('c3', 'c4')
+        frame = view.render(game.get_board(), 'WHITE to move')
+        self.assertEqual(frame.count(CELL_STYLE), 6)
+        for cursor in ('\033[3;11H', '\033[4;8H', '\033[6;11H'):
+            self.assertIn(cursor, frame)
+        self.assertTrue(frame.endswith('\033[23;1H\033[2KWHITE to move\n'))
+        self.assertEqual(view.render(game.get_board()), '\033[23;1H\033[2K\n')
+
+
+class GessRecordsTester(unittest.TestCase):
+    """
+    Contains unit tests for the gess_records file.
+    """
+    def test_move_codes(self):
+        """
+        Tests that moves fit in two bytes and decode to the moves encoded.
+        """
+        self.assertEqual(encode_move('B2', 'C3'), 7 * 17)
+        self.assertEqual(decode_move(encode_move('s19', 's2')), ('S19', 'S2'))
+        self.assertLess(encode_move('S19', 'S18'), 1 << 16)
+        for xy, xy2 in (('c3', 'd5'), ('c3', 'c3'), ('a1', 'c3'), ('c3', 'c21')):
+            self.assertRaises(ValueError, encode_move, xy, xy2)
+        self.assertRaises(ValueError, decode_move, 0)
+
+    def test_round_trip(self):
+        """
+        Tests streaming and memory-mapped reading of files written with and without an index.
+        """
+        games = [([('c3', 'c5'), ('R18', 'r15')], 'UNFINISHED'), ([], 'WHITE_WON'),
+                 ([('c3', 'b3'), ('c18', 'b18'), ('f3', 'c6')], 'BLACK_WON')]
+        expected = [([(xy.upper(), xy2.upper()) for xy, xy2 in moves], state) for moves, state in games]
+        with tempfile.TemporaryDirectory() as directory:
+            for index in (False, True):
+                path = os.path.join(directory, 'games' + str(index))
+                with open(path, 'wb') as stream:
+                    self.assertEqual(write_records(stream, iter(games), index), 3)
+                self.assertEqual(os.path.getsize(path), 8 + 3 * 4 + 5 * 2 + (4 + 3 * 8 + 20 if index else 0))
+                with open(path, 'rb') as stream:
+                    self.assertEqual(list(read_records(stream)), expected)
+                with RecordArchive(path) as archive:
+                    self.assertEqual(len(archive), 3)
+                    self.assertEqual(archive[2], expected[2])
+                    self.assertEqual(archive[-3], expected[0])
+                    self.assertRaises(IndexError, archive.get_record, 3)
+
+                # Corrupts the first record's game state byte.
+                with open(path, 'r+b') as stream:
+                    stream.seek(8 + 2)
+                    stream.write(b'\x09')
+                with open(path, 'rb') as stream:
+                    self.assertRaises(ValueError, list, read_records(stream))
+                with RecordArchive(path) as archive:
+                    self.assertRaises(ValueError, archive.get_record, 0)
+
+
+class GessSelfPlayTester(unittest.TestCase):
+    """
+    Contains unit tests for the gess_selfplay file.
+    """
+    def test_run(self):
+        """
+        Tests that parallel self-play writes the same legal games in order for any number of workers.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, 'games' + str(workers)) for workers in (1, 2)]
+            for workers, path in zip((1, 2), paths):
+                report = run_selfplay(path, 5, 'random', 'greedy', workers=workers, batch=2, seed=7)
+                self.assertEqual(report['games'], 5)
+                self.assertEqual(sum(report['results'].values()), 5)
+                self.assertLessEqual(len(report['utilization']), workers)
+            with open(paths[0], 'rb') as stream, open(paths[1], 'rb') as stream2:
+                self.assertEqual(stream.read(), stream2.read())
+            with RecordArchive(paths[0]) as archive:
+                self.assertEqual(len(archive), 5)
+                self.assertEqual(sum(len(archive[i][0]) for i in range(5)), report['moves'])
+                for i in range(5):
+                    self.assertIsNone(validate_moves(archive[i][0]))
+
+
+class GessTournamentTester(unittest.TestCase):
+    """
+    Contains unit tests for the gess_tournament file.
+    """
+    def test_elo_difference(self):
+        """
+        Tests Elo estimates and their confidence margins.
+        """
+        elo, margin = gess_tournament.elo_difference(30, 10, 0)
+        self.assertAlmostEqual(elo, 190.85, places=2)
+        self.assertAlmostEqual(margin, 135.6, places=1)
+        self.assertEqual(gess_tournament.elo_difference(5, 5, 10)[0], 0.0)
+        self.assertLess(gess_tournament.elo_difference(50, 50, 100)[1], gess_tournament.elo_difference(5, 5, 10)[1])
+        self.assertEqual(gess_tournament.elo_difference(3, 0, 0)[1], float('inf'))
+
+        # Drawn games alone still leave a margin, narrowing as more are played.
+        elo, margin = gess_tournament.elo_difference(0, 0, 10)
+        self.assertEqual(elo, 0.0)
+        self.assertAlmostEqual(margin, 98.9, places=1)
+        self.assertLess(gess_tournament.elo_difference(0, 0, 100)[1], margin)
+
+    def test_run(self):
+        """
+        Tests scheduling, openings, and standings of a small round robin and gauntlet.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'openings')
+            with open(path, 'w') as stream:
+                stream.write('# openings\nc3-c5 r18-r15\n\nl3-l6\n')
+            openings = gess_tournament.load_openings(path)
+            self.assertEqual(openings, [[('c3', 'c5'), ('r18', 'r15')], [('l3', 'l6')]])
+            with open(path, 'w') as stream:
+                stream.write('c3-c5\nc3-c5 c3-c6\n')
+            with self.assertRaises(ValueError):
+                gess_tournament.load_openings(path)
+
+        players = ['random', 'greedy', 'engine:10:1']
+        self.assertEqual(len(gess_tournament.schedule(players, openings, rounds=2)), 3 * 2 * 2 * 2)
+        self.assertEqual(len(gess_tournament.schedule(players, openings, gauntlet=True)), 2 * 2 * 2)
+        with self.assertRaises(ValueError):
+            gess_tournament.play_match('random', 'greedy', [('c3', 'c5'), ('c5', 'c7')])
+        results = gess_tournament.run(players[:2], openings, workers=1, max_moves=40)
+        self.assertEqual([(black, white) for black, white, moves, game_state in results],
+                         [('random', 'greedy'), ('greedy', 'random')] * 2)
+        for black, white, moves, game_state in results:
+            self.assertIsNone(validate_moves(moves))
+        totals, pairs = gess_tournament.standings(results)
+        self.assertEqual(sum(totals['random']), 4)
+        self.assertEqual(totals['random'], [totals['greedy'][1], totals['greedy'][0], totals['greedy'][2]])
+        self.assertEqual(pairs[('random', 'greedy')], totals['random'])
+
+
+class GessBookTester(unittest.TestCase):
+    """
+    Contains unit tests for the gess_book file.
+    """
+    def test_book(self):
+        """
+        Tests building a book from games and looking up positions by hash.
+        """
+        games = [([('c3', 'c5'), ('r18', 'r15'), ('l3', 'l6')], 'BLACK_WON'),
+                 ([('c3', 'c5'), ('r18', 'r15')], 'WHITE_WON'),
+                 ([('l3', 'l6'), ('r18', 'r15'), ('c3', 'c5')], 'UNFINISHED'),
+                 ([('c3', 'c5'), ('c3', 'c4')], 'BLACK_WON')]
+        counts = count_moves(games, depth=2)
+        self.assertEqual(counts[(GessGame().get_hash(), encode_move('c3', 'c5'))], [3, 4])
+        self.assertEqual(len(counts), 4)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'book')
+            with open(path, 'wb') as stream:
+                self.assertEqual(write_book(stream, count_moves(games), min_games=1), 6)
+            self.assertEqual(os.path.getsize(path), 16 + 6 * 16)
+            with OpeningBook(path) as book:
+                self.assertEqual(len(book), 6)
+                self.assertEqual(book.lookup(GessGame().get_hash()), [(('C3', 'C5'), 3, 4), (('L3', 'L6'), 1, 1)])
+                game = GessGame()
+                self.assertEqual(book.choose_move(game), ('C3', 'C5'))
+                self.assertIn(book.choose_move(game, random.Random(1)), [('C3', 'C5'), ('L3', 'L6')])
+
+                # The first game reaches this position by another order, and neither game goes on from it.
+                game.make_move('l3', 'l6')
+                game.make_move('r18', 'r15')
+                self.assertEqual(book.lookup(game.get_hash()), [(('C3', 'C5'), 1, 1)])
+                game.make_move('c3', 'c5')
+                self.assertIsNone(book.choose_move(game))
+                self.assertEqual(len(pickle.loads(pickle.dumps(book))), 6)
+
+            with open(path, 'wb') as stream:
+                stream.write(b'GESS' + bytes(12))
+            with self.assertRaises(ValueError):
+                OpeningBook(path)
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class GessEvalTester(unittest.TestCase):
+    """
+    Contains unit tests for the gess_eval file.
+    """
+    def test_features(self):
+        """
+        Tests batch features against the game's own stone and ring counts and the engine's evaluation.
+        """
+        from gess_engine import evaluate
+        games = [GessGame(), GessGame(), GessGame()]
+        games[1].make_move('c3', 'c5')
+        for xy, xy2 in (('m7', 'k7'), ('m14', 'K14'), ('l3', 'l6'), ('l18', 'l15'), ('l6', 'l9'), ('l15', 'l13')):
+            self.assertTrue(games[2].make_move(xy, xy2))
+        boards = gess_eval.boards_from_games(games)
+        self.assertEqual(boards.shape, (3, 20, 20))
+        self.assertEqual(boards.dtype, numpy.int8)
+
+        values = gess_eval.features(boards)
+        for i, game in enumerate(games):
+            for column, stone in enumerate('BW'):
+                self.assertEqual(values['stones'][i, column], bin(game.get_bitboard(stone)).count('1'))
+                self.assertEqual(values['rings'][i, column], bin(game.get_rings(stone)).count('1'))
+        self.assertEqual(values['rings'][0].tolist(), [1, 1])
+        self.assertEqual(values['near_rings'][0].tolist(), [0, 0])
+        self.assertEqual(values['mobility'][0, 0], values['mobility'][0, 1])
+
+        scores = gess_eval.evaluate_games(games, {'stones': 1, 'rings': 100})
+        self.assertEqual(scores.tolist(), [evaluate(game) for game in games])
+        self.assertEqual(gess_eval.evaluate_batch(boards[:1]).tolist(), [0])
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class GessVectorEnvTester(unittest.TestCase):
+    """
+    Contains unit tests for the gess_env file.
+    """
+    def test_legal_action_mask(self):
+        """
+        Tests batched legal moves against generate_moves in the saved perft positions.
+        """
+        from gess_perft import load_position
+        games = [GessGame(), load_position('diagonals'), load_position('ring_attack')]
+        env = gess_env.GessVectorEnv(4)
+        for i, game in enumerate(games):
+            env.load(i, game)
+        env.get_states()[3] = 1
+        mask = env.legal_action_mask()
+        self.assertEqual(mask.shape, (4, gess_env.ACTIONS))
+        for i, game in enumerate(games):
+            self.assertEqual(numpy.flatnonzero(mask[i]).tolist(), sorted(MOVE_CODES[move] for move in game.generate_moves()))
+        self.assertFalse(mask[3].any())
+
+    def test_step(self):
+        """
+        Tests stepping random moves in several games against make_move until each game ends.
+        """
+        rng = random.Random(3)
+        env = gess_env.GessVectorEnv(4)
+        games = [GessGame() for i in range(4)]
+        boards = env.get_boards()
+        observations = env.reset()
+        self.assertEqual(observations.shape, (4, 2, 20, 20))
+        self.assertEqual(observations[0, 0].sum(), bin(games[0].get_bitboard('B')).count('1'))
+        done, won = numpy.zeros(4, bool), numpy.zeros(4, int)
+        while not done.all():
+            actions = [rng.choice(numpy.flatnonzero(mask).tolist()) if mask.any() else 0 for mask in env.legal_action_mask()]
+            for game, action in zip(games, actions):
+                if game.get_game_state() == 'UNFINISHED':
+                    self.assertTrue(game.make_move(*MOVES[action]))
+            observations, rewards, done = env.step(actions)
+            won += rewards
+            self.assertIs(env.get_boards(), boards)
+            for i, game in enumerate(games):
+                self.assertEqual(env.get_game(i).get_board(), game.get_board())
+                self.assertEqual(env.get_game(i).get_turn(), game.get_turn())
+                self.assertEqual(env.get_game(i).get_game_state(), game.get_game_state())
+        self.assertEqual(won.tolist(), [1, 1, 1, 1])
+
+        env.reset([0])
+        self.assertEqual(env.get_game(0).get_board(), GessGame().get_board())
+        with self.assertRaises(ValueError):
+            env.step([0, 0, 0, 0])
+
@@ -0,0 +1,41 @@
+# Description: Perft regression tests for the Gess move generator.
+
+from gess_perft import POSITIONS, load_position, perft, divide
+import unittest
+
+# Known-good leaf counts by position and depth, checked against make_move over every pair of squares.
+COUNTS = {
+    'start': [1, 322, 103684],
+    'opening': [1, 323, 101068],
+    'diagonals': [1, 279, 79151],
+    'ring_attack': [1, 346, 113887],
+}
+
+
+class PerftTester(unittest.TestCase):
+    """
+    Contains perft regression tests for the gess_perft file.
+    """
+    def test_counts(self):
+        """
+        Tests leaf counts from every saved position, and that counting leaves the game unchanged.
+        """
+        self.assertEqual(sorted(COUNTS), sorted(POSITIONS))
+        for name, counts in COUNTS.items():
+            game = load_position(name)
+            start = game.get_hash()
+            for depth, nodes in enumerate(counts):
+                self.assertEqual(perft(game, depth), nodes, name + ' depth ' + str(depth))
+            self.assertEqual(game.get_hash(), start)
+
+    def test_divide(self):
+        """
+        Tests that the counts below each first move add up to the perft count.
+        """
+        game = load_position('ring_attack')
+        counts = divide(game, 2)
+        self.assertEqual(len(counts), 346)
+        self.assertEqual(sum(counts.values()), 113887)
+
+        # Moves destroying WHITE's last ring end the game.
+        self.assertEqual(counts[('L9', 'L11')], 0)
@@ -0,0 +1,193 @@
+# Description: Opening book built from recorded games, stored as a sorted file of fixed-size
+# records that is memory-mapped and searched by position hash.
+#
+# A book file starts with a 16-byte header: b'GBOK', a format version byte, 3 reserved bytes, and
+# the number of entries (8 bytes). Each 16-byte entry holds a position's GessGame.get_hash()
+# (8 bytes), the gess_records code of a move played there (2 bytes), the number of games playing
+# it (2 bytes), and the mover's points from those games (4 bytes, 2 for a win and 1 for an
+# unfinished game). All integers are big-endian. Entries are sorted by hash, then by games
+# played, most first, so a position's moves are adjacent and found by binary search. Positions of
+# one book file mapped by several processes share the same pages of memory.
+
+import argparse
+import mmap
+import struct
+from GessGame import GessGame
+from gess_records import encode_move, decode_move, read_records
+
+MAGIC = b'GBOK'
+VERSION = 1
+HEADER = struct.Struct('>4sB3xQ')
+ENTRY = struct.Struct('>QHHI')
+
+# Points for the player to move by game state, counted from the mover's turn.
+POINTS = {('BLACK', 'BLACK_WON'): 2, ('WHITE', 'WHITE_WON'): 2, ('BLACK', 'UNFINISHED'): 1,
+          ('WHITE', 'UNFINISHED'): 1}
+
+
+def count_moves(records, depth=12):
+    """
+    Replays the first moves of each game from the initial layout, counting how often and how
+    successfully each move was played in each position. A game's moves after an illegal one are skipped.
+    :param records: iterable of (moves, game state) pairs, as yielded by gess_records.read_records
+    :param depth: moves of each game to count (int)
+    :return: dict of (position hash, move code) to [games, points]
+    """
+    counts = {}
+    for moves, game_state in records:
+        game = GessGame()
+        for xy, xy2 in moves[:depth]:
+            position, turn = game.get_hash(), game.get_turn()
+            if not game.push_move(xy, xy2):
+                break
+            entry = counts.setdefault((position, encode_move(xy, xy2)), [0, 0])
+            entry[0] += 1
+            entry[1] += POINTS.get((turn, game_state), 0)
+    return counts
+
+
+def write_book(stream, counts, min_games=1):
+    """
+    Writes counted moves as a sorted book, capping games at 65535 and scaling points with them.
+    :param stream: binary file opened for writing
+    :param counts: dict of (position hash, move code) to [games, points], as returned by count_moves
+    :param min_games: fewest games a move needs to be kept (int)
+    :return: number of entries written (int)
+    """
+    entries = []
+    for (position, code), (games, points) in counts.items():
+        if games >= min_games:
+            if games > 0xffff:
+                games, points = 0xffff, points * 0xffff // games
+            entries.append((position, -games, code, points))
+    entries.sort()
+    stream.write(HEADER.pack(MAGIC, VERSION, len(entries)))
+    stream.write(b''.join(ENTRY.pack(position, code, -games, points) for position, games, code, points in entries))
+    return len(entries)
+
+
+class OpeningBook:
+    """
+    Memory-maps a book file and looks up the moves played in a position by binary search.
+    Pickling a book reopens it by path, so worker processes map the same file.
+    """
+    def __init__(self, path):
+        """
+        Opens and maps the file.
+        :param path: book file path (string)
+        :raises ValueError: if the file is not a book file of a known version
+        """
+        self._path = path
+        with open(path, 'rb') as stream:
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            raise ValueError('missing book header')
+        magic, version, self._count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or len(self._map) < HEADER.size + self._count * ENTRY.size:
+            raise ValueError('not a version ' + str(VERSION) + ' Gess book file')
+
+    def __len__(self):
+        """
+        :return: number of entries (int)
+        """
+        return self._count
+
+    def __reduce__(self):
+        """
+        :return: arguments reopening the book from its path when unpickled
+        """
+        return OpeningBook, (self._path,)
+
+    def __enter__(self):
+        """
+        :return: the book, closed when the with block ends
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Closes the book.
+        """
+        self.close()
+
+    def get_entry(self, index):
+        """
+        :param index: entry number (int)
+        :return: (position hash, move code, games, points) tuple
+        """
+        return ENTRY.unpack_from(self._map, HEADER.size + index * ENTRY.size)
+
+    def lookup(self, position):
+        """
+        :param position: position hash, from GessGame.get_hash() (int)
+        :return: list of ((start, end) alphanumeric position tuple, games, points) tuples, most
+                 played first, empty if the position is not in the book
+        """
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_entry(middle)[0] < position:
+                low = middle + 1
+            else:
+                high = middle
+        moves = []
+        while low < self._count:
+            entry_position, code, games, points = self.get_entry(low)
+            if entry_position != position:
+                break
+            moves.append((decode_move(code), games, points))
+            low += 1
+        return moves
+
+    def choose_move(self, game, rng=None):
+        """
+        Picks a book move for the player to move, the most played one, or one chosen at random in
+        proportion to games played when a random.Random instance is given.
+        :param game: GessGame instance
+        :param rng: random.Random instance, or None
+        :return: (start, end) alphanumeric position tuple, or None if the position is not in the book
+        """
+        moves = self.lookup(game.get_hash())
+        if not moves:
+            return None
+        if rng is None:
+            return moves[0][0]
+        return rng.choices([move for move, games, points in moves], [games for move, games, points in moves])[0]
+
+    def close(self):
+        """
+        Unmaps the file.
+        :return: None
+        """
+        self._map.close()
+
+
+def main():
+    """
+    Builds a book from a record file, or shows the book moves after a line of moves.
+    """
+    parser = argparse.ArgumentParser(description='Build or probe a Gess opening book.')
+    parser.add_argument('book', help='book file')
+    parser.add_argument('--build', metavar='RECORDS', help='gess_records file of games to build the book from')
+    parser.add_argument('--depth', type=int, default=12, help='moves of each game to count')
+    parser.add_argument('--min-games', type=int, default=2, help='fewest games a kept move needs')
+    parser.add_argument('--show', nargs='*', metavar='MOVE', help='show book moves after moves such as c3-c5')
+    args = parser.parse_args()
+
+    if args.build:
+        with open(args.build, 'rb') as stream:
+            counts = count_moves(read_records(stream), args.depth)
+        with open(args.book, 'wb') as stream:
+            print(write_book(stream, counts, args.min_games), 'entries')
+    if args.show is not None:
+        game = GessGame()
+        for move in args.show:
+            if move.count('-') != 1 or not game.make_move(*move.split('-')):
+                parser.error('illegal move ' + move)
+        with OpeningBook(args.book) as book:
+            for move, games, points in book.lookup(game.get_hash()):
+                print('-'.join(move), games, 'games', '{:.0%}'.format(points / (2 * games)))
+
+
+if __name__ == '__main__':
+    main()
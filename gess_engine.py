@@ -0,0 +1,285 @@
+# Description: Alpha-beta search engine that plays Gess as a computer player.
+
+import time
+from GessGame import FOOTPRINT_MASKS, LABELS
+from gess_transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+# Score of a won position; wins found sooner score higher.
+WIN_SCORE = 100000
+
+# Scores at least this far from zero are wins or losses, counted in plies from the root.
+WIN_BOUND = WIN_SCORE - 1000
+
+# (row, column) coordinates of every piece center, keyed by alphanumeric position.
+COORDINATES = {LABELS[tup]: tup for tup in FOOTPRINT_MASKS}
+
+
+def evaluate(game):
+    """
+    Scores a position for the player to move by rings held, then by stones on the board.
+    :param game: GessGame instance
+    :return: score, positive when the player to move is ahead (int)
+    """
+    stone = game.get_turn()[0]
+    other = 'W' if stone == 'B' else 'B'
+    rings = bin(game.get_rings(stone)).count('1') - bin(game.get_rings(other)).count('1')
+    stones = bin(game.get_bitboard(stone)).count('1') - bin(game.get_bitboard(other)).count('1')
+    return 100 * rings + stones
+
+
+def score_to_table(score, ply):
+    """
+    Counts a win or loss from the position being stored rather than from the root, so the
+    entry holds the same distance to the result wherever the position is reached.
+    :param score: score counted from the root (int)
+    :param ply: plies from the root to the position (int)
+    :return: score to store (int)
+    """
+    if score >= WIN_BOUND:
+        return score + ply
+    if score <= -WIN_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_table(score, ply):
+    """
+    Counts a stored win or loss from the root again, undoing score_to_table.
+    :param score: stored score (int)
+    :param ply: plies from the root to the position (int)
+    :return: score counted from the root (int)
+    """
+    if score >= WIN_BOUND:
+        return score - ply
+    if score <= -WIN_BOUND:
+        return score + ply
+    return score
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the time budget runs out or the search is stopped.
+    """
+    pass
+
+
+class GessEngine:
+    """
+    Computer player that searches GessGame positions with iterative-deepening alpha-beta.
+    Moves are ordered by the transposition table, killer moves, then stones captured, and
+    the best move from the deepest completed iteration is played when time runs out.
+    """
+    def __init__(self, movetime=1000, max_depth=32, table_size=1 << 18):
+        """
+        Initializes search settings, the transposition table, and search statistics.
+        :param movetime: time budget per move in milliseconds (int)
+        :param max_depth: deepest iteration to search (int)
+        :param table_size: number of transposition table slots (int)
+        """
+        self._movetime = movetime
+        self._max_depth = max_depth
+        self._table = TranspositionTable(table_size)
+        self._killers = {}
+        self._deadline = 0.0
+        self._stopped = False
+        self._nodes = 0
+        self._elapsed = 0.0
+        self._depth = 0
+
+    def get_nodes(self):
+        """
+        :return: nodes visited by the last search (int)
+        """
+        return self._nodes
+
+    def get_nps(self):
+        """
+        :return: nodes per second of the last search (int)
+        """
+        if self._elapsed == 0:
+            return 0
+        return int(self._nodes / self._elapsed)
+
+    def get_depth(self):
+        """
+        :return: deepest iteration completed by the last search (int)
+        """
+        return self._depth
+
+    def choose_move(self, game):
+        """
+        Picks a move for the player to move within the engine's time budget.
+        :param game: GessGame instance
+        :return: (start, end) alphanumeric position tuple, or None if there is no legal move
+        """
+        return self.search(game)
+
+    def stop(self):
+        """
+        Ends a search in progress, which then returns its best move so far. Safe to call from another thread.
+        :return: None
+        """
+        self._stopped = True
+
+    def clear_stop(self):
+        """
+        Forgets any earlier stop, for a caller starting a search in another thread that a stop
+        sent before the search begins must still end.
+        :return: None
+        """
+        self._stopped = False
+
+    def search(self, game, movetime=None, max_depth=None, info=None, clear_stop=True):
+        """
+        Runs iterative-deepening alpha-beta until the time budget or maximum depth is reached.
+        The game is searched in place with push_move and pop_move and is left as it was found.
+        :param game: GessGame instance
+        :param movetime: time budget in milliseconds, defaults to the engine's (int)
+        :param max_depth: deepest iteration to search, defaults to the engine's (int)
+        :param info: called with a dict of depth, score, nodes, nps, time (ms), and pv after each iteration
+        :param clear_stop: forgets any earlier stop, False when the caller has already called clear_stop (bool)
+        :return: (start, end) alphanumeric position tuple, or None if there is no legal move
+        """
+        start = time.monotonic()
+        self._deadline = start + (self._movetime if movetime is None else movetime) / 1000
+        if clear_stop:
+            self._stopped = False
+        self._nodes = 0
+        self._depth = 0
+        self._killers = {}
+        self._table.new_search()
+
+        if max_depth is None:
+            max_depth = self._max_depth
+        moves = game.generate_moves()
+        best = moves[0] if moves else None
+        for depth in range(1, max_depth + 1):
+            if len(moves) < 2:
+                break
+            try:
+                score, best = self._root(game, moves, depth, best)
+            except SearchTimeout:
+                break
+            self._depth = depth
+            self._elapsed = time.monotonic() - start
+            if info is not None:
+                info({'depth': depth, 'score': score, 'nodes': self._nodes, 'nps': self.get_nps(),
+                      'time': int(self._elapsed * 1000), 'pv': self.principal_variation(game, depth)})
+
+            # A forced win or loss will not change with a deeper search.
+            if abs(score) >= WIN_SCORE - max_depth:
+                break
+        self._elapsed = time.monotonic() - start
+        return best
+
+    def principal_variation(self, game, depth):
+        """
+        Follows best moves stored in the transposition table from the current position.
+        :param game: GessGame instance
+        :param depth: longest line to follow (int)
+        :return: list of (start, end) alphanumeric position tuples
+        """
+        line = []
+        for ply in range(depth):
+            entry = self._table.probe(game.get_hash())
+            if entry is None or entry[3] is None or not game.push_move(*entry[3]):
+                break
+            line.append(entry[3])
+        for move in line:
+            game.pop_move()
+        return line
+
+    def _root(self, game, moves, depth, best):
+        """
+        Searches every root move to the given depth, trying the previous best move first.
+        :return: (score, best move) tuple
+        """
+        alpha = -WIN_SCORE - 1
+        best_move = best
+        for move in self._order(game, moves, best, 0):
+            game.push_move(*move)
+            try:
+                score = -self._negamax(game, depth-1, -WIN_SCORE - 1, -alpha, 1)
+            finally:
+                game.pop_move()
+            if score > alpha:
+                alpha, best_move = score, move
+        self._table.store(game.get_hash(), depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def _negamax(self, game, depth, alpha, beta, ply):
+        """
+        Alpha-beta search of one position, scored for the player to move.
+        :return: score of the position (int)
+        """
+        self._nodes += 1
+
+        # Interior nodes cost a generate_moves call each, so they check the clock every time;
+        # cheap leaves check it every 256 nodes.
+        if (depth > 0 or self._nodes & 255 == 0) and (self._stopped or time.monotonic() >= self._deadline):
+            raise SearchTimeout
+
+        # The previous move destroyed the last ring of the player to move.
+        if game.get_game_state() != 'UNFINISHED':
+            return -WIN_SCORE + ply
+        if depth == 0:
+            return evaluate(game)
+
+        key = game.get_hash()
+        entry = self._table.probe(key)
+        best_move = None
+        if entry is not None:
+            entry_depth, score, bound, best_move = entry
+            score = score_from_table(score, ply)
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    return score
+                if bound == LOWER and score >= beta:
+                    return score
+                if bound == UPPER and score <= alpha:
+                    return score
+
+        moves = game.generate_moves()
+        if not moves:
+            return 0
+
+        alpha_start = alpha
+        best_score = -WIN_SCORE - 1
+        for move in self._order(game, moves, best_move, ply):
+            game.push_move(*move)
+            try:
+                score = -self._negamax(game, depth-1, -beta, -alpha, ply+1)
+            finally:
+                game.pop_move()
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self._killers[ply] = move
+                        break
+
+        if best_score <= alpha_start:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self._table.store(key, depth, score_to_table(best_score, ply), bound, best_move)
+        return best_score
+
+    def _order(self, game, moves, best, ply):
+        """
+        Sorts moves so the stored best move and killer move come first, then moves capturing the most stones.
+        :return: list of (start, end) alphanumeric position tuples
+        """
+        opponent = game.get_bitboard('W' if game.get_turn() == 'BLACK' else 'B')
+        killer = self._killers.get(ply)
+
+        def priority(move):
+            if move == best:
+                return 1000
+            if move == killer:
+                return 500
+            return bin(opponent & FOOTPRINT_MASKS[COORDINATES[move[1]]]).count('1')
+        return sorted(moves, key=priority, reverse=True)
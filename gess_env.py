@@ -0,0 +1,257 @@
+# Description: Vectorized environment stepping many Gess games at once for self-play. Requires NumPy.
+#
+# All boards live in one K x 20 x 20 int8 array, with 1 for BLACK stones, -1 for WHITE stones, and 0
+# for empty squares as in gess_eval. Actions are the move codes of gess_records,
+# start * 136 + direction * 17 + distance - 1, so a legal action mask is K x 44064.
+
+import numpy as np
+from GessGame import GessGame, DIRECTIONS
+from gess_eval import box_sums, boards_from_games
+from gess_records import MOVES
+from gess_state import STATES
+
+# Number of move codes.
+ACTIONS = len(MOVES)
+
+# Row and column step of each direction, by direction number.
+DIRECTION_ROWS = np.array([d_row for index, d_row, d_col in DIRECTIONS])
+DIRECTION_COLS = np.array([d_col for index, d_row, d_col in DIRECTIONS])
+
+# Offsets from a piece center to its footprint, and, by direction number, to the leading edge
+# squares newly covered when a step in that direction brings the center there.
+OFFSETS = np.array([-1, 0, 1])
+EDGE_OFFSETS = [[(o_row, o_col) for o_row in (-1, 0, 1) for o_col in (-1, 0, 1)
+                 if abs(o_row + d_row) == 2 or abs(o_col + d_col) == 2] for index, d_row, d_col in DIRECTIONS]
+
+# Piece centers within reach of a slide, padded by 17 squares on each side of the 18 x 18 centers.
+PAD = 17
+INSIDE = np.zeros((18 + 2*PAD, 18 + 2*PAD), bool)
+INSIDE[PAD:PAD+18, PAD:PAD+18] = True
+
+START_BOARD = boards_from_games([GessGame()])[0]
+
+# Legal actions checked at a time when a move might destroy the mover's last ring.
+CHUNK = 4096
+
+
+def has_ring(boards, players):
+    """
+    :param boards: M x 20 x 20 int8 array of boards
+    :param players: length M array of 1 for BLACK and -1 for WHITE
+    :return: length M bool array, True where the player has a ring
+    """
+    own = (boards == players[:, None, None]).view(np.int8)
+    return ((box_sums(own) == 8) & (boards[:, 1:19, 1:19] == 0)).any(axis=(1, 2))
+
+
+def move_pieces(boards, games, rows, cols, rows2, cols2):
+    """
+    Lifts each game's piece from its start footprint and sets it down on its end footprint,
+    capturing any stones there, as set_footprint does.
+    :param boards: K x 20 x 20 int8 array of boards, changed in place
+    :param games: length M array of distinct board indices
+    :param rows: length M array of start center rows, 1-18 counting from board row 1 as 0
+    :param cols: length M array of start center columns, 1-18
+    :param rows2: length M array of end center rows
+    :param cols2: length M array of end center columns
+    :return: None
+    """
+    games = games[:, None, None]
+    piece = boards[games, rows[:, None, None] + OFFSETS[:, None], cols[:, None, None] + OFFSETS]
+    boards[games, rows[:, None, None] + OFFSETS[:, None], cols[:, None, None] + OFFSETS] = 0
+    boards[games, rows2[:, None, None] + OFFSETS[:, None], cols2[:, None, None] + OFFSETS] = piece
+
+
+def legal_actions(boards, turns, active):
+    """
+    Finds every legal move in a batch of positions by the rules of GessGame.make_move.
+    Each direction is swept one distance at a time across all games and piece centers together.
+    A move keeps the mover's ring if a ring lies beyond reach of both footprints; only moves near
+    every ring are played out on copies of their boards to check.
+    :param boards: K x 20 x 20 int8 array of boards
+    :param turns: length K array of 1 where BLACK is to move and -1 where WHITE is
+    :param active: length K bool array, False for finished games, which have no legal moves
+    :return: K x ACTIONS bool array
+    """
+    count = len(boards)
+    own = (boards == turns[:, None, None]).view(np.int8)
+    opponent = (boards == -turns[:, None, None]).view(np.int8)
+    occupied = own | opponent
+    own_sums, opponent_sums = box_sums(own), box_sums(opponent)
+    center = own[:, 1:19, 1:19] == 1
+
+    # legal_start: the footprint holds the mover's stones, none of the opponent's, and more than a center stone.
+    starts = (own_sums > 0) & (opponent_sums == 0) & ~(center & (own_sums == 1)) & active[:, None, None]
+
+    # Counts the mover's rings within two squares of each center, which a footprint there can touch.
+    rings = np.zeros((count, 22, 22), np.int8)
+    rings[:, 2:20, 2:20] = (own_sums == 8) & (occupied[:, 1:19, 1:19] == 0)
+    ring_count = rings.sum(axis=(1, 2), dtype=np.int32)[:, None, None]
+    near = rings[:, :18] + rings[:, 1:19] + rings[:, 2:20] + rings[:, 3:21] + rings[:, 4:]
+    near = near[:, :, :18] + near[:, :, 1:19] + near[:, :, 2:20] + near[:, :, 3:21] + near[:, :, 4:]
+    near_ends = np.zeros((count, 18 + 2*PAD, 18 + 2*PAD), np.int8)
+    near_ends[:, PAD:PAD+18, PAD:PAD+18] = near
+
+    # Fills the mask by direction and distance, where each slice is contiguous, then reorders it.
+    mask = np.zeros((8, 17, count, 18, 18), bool)
+    uncertain = np.zeros((8, 17, count, 18, 18), bool)
+    for number, (index, d_row, d_col) in enumerate(DIRECTIONS):
+        clear = starts & (own[:, 1+d_row:19+d_row, 1+d_col:19+d_col] == 1)
+        edges = np.ones((count, 18 + 2*PAD, 18 + 2*PAD), bool)
+        edges[:, PAD:PAD+18, PAD:PAD+18] = sum(occupied[:, 1+o_row:19+o_row, 1+o_col:19+o_col]
+                                              for o_row, o_col in EDGE_OFFSETS[number]) > 0
+        for distance in range(1, 18):
+
+            # Pieces with a blank center may only move up to 3 squares.
+            if distance == 4:
+                clear &= center
+            if not clear.any():
+                break
+            row, col = PAD + d_row * distance, PAD + d_col * distance
+            legal = clear & INSIDE[row:row+18, col:col+18]
+            mask[number, distance-1] = legal
+            uncertain[number, distance-1] = legal & (near + near_ends[:, row:row+18, col:col+18] >= ring_count)
+
+            # Piece may not slide past a stone in its leading edge.
+            clear &= ~edges[:, row:row+18, col:col+18]
+
+    # Plays out moves that might leave the mover without a ring.
+    numbers, distances, games, rows, cols = np.unravel_index(np.flatnonzero(uncertain), uncertain.shape)
+    for start in range(0, len(games), CHUNK):
+        part = slice(start, start + CHUNK)
+        copies = boards[games[part]]
+        rows2 = rows[part] + 1 + DIRECTION_ROWS[numbers[part]] * (distances[part] + 1)
+        cols2 = cols[part] + 1 + DIRECTION_COLS[numbers[part]] * (distances[part] + 1)
+        move_pieces(copies, np.arange(len(copies)), rows[part] + 1, cols[part] + 1, rows2, cols2)
+        lost = ~has_ring(copies, turns[games[part]])
+        mask[numbers[part][lost], distances[part][lost], games[part][lost], rows[part][lost], cols[part][lost]] = False
+    return np.ascontiguousarray(mask.transpose(2, 3, 4, 0, 1)).reshape(count, ACTIONS)
+
+
+class GessVectorEnv:
+    """
+    Steps many Gess games at once on shared arrays for self-play. Boards, turns, and game states
+    are returned as views of the shared arrays, and every call works on all games together.
+    """
+    def __init__(self, count):
+        """
+        Initializes every game to the starting layout.
+        :param count: number of games (int)
+        """
+        self._boards = np.repeat(START_BOARD[None], count, axis=0)
+        self._turns = np.ones(count, np.int8)
+        self._states = np.zeros(count, np.int8)
+        self._mask = None
+
+    def get_count(self):
+        """
+        :return: number of games (int)
+        """
+        return len(self._boards)
+
+    def get_boards(self):
+        """
+        :return: K x 20 x 20 int8 array of boards, shared with the environment
+        """
+        return self._boards
+
+    def get_turns(self):
+        """
+        :return: length K int8 array of 1 where BLACK is to move and -1 where WHITE is, shared
+        """
+        return self._turns
+
+    def get_states(self):
+        """
+        :return: length K int8 array of game states, indexes into gess_state.STATES, shared
+        """
+        return self._states
+
+    def reset(self, games=None):
+        """
+        Sets games back to the starting layout.
+        :param games: indices of the games to reset, defaults to all (array or list of ints)
+        :return: observations of every game, as returned by observations
+        """
+        games = slice(None) if games is None else games
+        self._boards[games] = START_BOARD
+        self._turns[games] = 1
+        self._states[games] = 0
+        self._mask = None
+        return self.observations()
+
+    def load(self, index, game):
+        """
+        Copies a game's position into one slot.
+        :param index: game slot (int)
+        :param game: GessGame instance
+        :return: None
+        """
+        self._boards[index] = boards_from_games([game])[0]
+        self._turns[index] = 1 if game.get_turn() == 'BLACK' else -1
+        self._states[index] = STATES.index(game.get_game_state())
+        self._mask = None
+
+    def get_game(self, index):
+        """
+        :param index: game slot (int)
+        :return: GessGame instance in that game's position
+        """
+        board = [[' '] * 20] + [[' BW'[cell] for cell in row] for row in self._boards[index].tolist()]
+        game = GessGame()
+        game.set_position(board, 'BLACK' if self._turns[index] == 1 else 'WHITE', STATES[self._states[index]])
+        return game
+
+    def observations(self):
+        """
+        :return: K x 2 x 20 x 20 int8 array of the stones of the player to move, then the opponent's
+        """
+        relative = self._boards * self._turns[:, None, None]
+        return np.stack((relative == 1, relative == -1), axis=1).view(np.int8)
+
+    def legal_action_mask(self):
+        """
+        :return: K x ACTIONS bool array of legal moves, all False for finished games
+        """
+        if self._mask is None:
+            self._mask = legal_actions(self._boards, self._turns, self._states == 0)
+        return self._mask
+
+    def step(self, actions):
+        """
+        Makes one move in every unfinished game. Actions for finished games are ignored.
+        :param actions: length K array of move codes
+        :return: (observations, rewards, done) tuple, where rewards is a length K int8 array of 1
+                 where the move won the game, and done is a length K bool array of finished games
+        :raises ValueError: if an action is not legal in its unfinished game
+        """
+        actions = np.asarray(actions, np.int64)
+        games = np.nonzero(self._states == 0)[0]
+        codes = actions[games]
+        legal = (codes >= 0) & (codes < ACTIONS)
+        legal[legal] = self.legal_action_mask()[games[legal], codes[legal]]
+        if not legal.all():
+            raise ValueError('illegal action ' + str(codes[~legal][0]) + ' in game ' + str(games[~legal][0]))
+
+        rewards = np.zeros(len(self._boards), np.int8)
+        if len(games):
+            start, rest = np.divmod(codes, 136)
+            number, distance = np.divmod(rest, 17)
+            rows, cols = start // 18 + 1, start % 18 + 1
+            rows2 = rows + DIRECTION_ROWS[number] * (distance + 1)
+            cols2 = cols + DIRECTION_COLS[number] * (distance + 1)
+            move_pieces(self._boards, games, rows, cols, rows2, cols2)
+
+            # Rings are checked before stones are removed from the edges, as in make_move.
+            movers = self._turns[games]
+            won = ~has_ring(self._boards[games], -movers)
+            self._states[games[won]] = np.where(movers[won] == 1, 1, 2)
+            rewards[games[won]] = 1
+
+            self._boards[games, 0] = 0
+            self._boards[games, 19] = 0
+            self._boards[games, :, 0] = 0
+            self._boards[games, :, 19] = 0
+            self._turns[games] *= -1
+        self._mask = None
+        return self.observations(), rewards, self._states != 0
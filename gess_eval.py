@@ -0,0 +1,103 @@
+# Description: Batched static evaluation of Gess positions with NumPy. Requires NumPy.
+#
+# Boards are N x 20 x 20 int8 arrays with 1 for BLACK stones, -1 for WHITE stones, and 0 for empty
+# squares. Row 0 of an array is board row 1, and column 0 is column A, matching the bitboards.
+
+import numpy as np
+
+BLACK, WHITE = 1, -1
+
+# Feature weights for evaluate_batch. With only stones and rings weighted 1 and 100, scores
+# match gess_engine.evaluate.
+WEIGHTS = {'stones': 1, 'rings': 100, 'near_rings': 10, 'mobility': 1}
+
+
+def bitboard_arrays(bitboards):
+    """
+    :param bitboards: sequence of bitboards (ints)
+    :return: N x 20 x 20 int8 array with 1 where each bitboard has a stone
+    """
+    data = np.frombuffer(b''.join(bits.to_bytes(50, 'little') for bits in bitboards), np.uint8)
+    return np.unpackbits(data, bitorder='little').view(np.int8).reshape(len(bitboards), 20, 20)
+
+
+def boards_from_games(games):
+    """
+    :param games: sequence of GessGame or GessState instances
+    :return: N x 20 x 20 int8 array of boards
+    """
+    black = bitboard_arrays([game.get_bitboard('B') for game in games])
+    white = bitboard_arrays([game.get_bitboard('W') for game in games])
+    return black - white
+
+
+def box_sums(stones):
+    """
+    Convolves boards with a 3 x 3 box of ones, giving the stones in each piece footprint.
+    :param stones: N x 20 x 20 array of 0 and 1
+    :return: N x 18 x 18 int8 array of stones in the footprint centered on each piece center
+    """
+    # The box is separable: sums three rows, then three columns of those sums.
+    rows = stones[:, :18] + stones[:, 1:19] + stones[:, 2:]
+    return rows[:, :, :18] + rows[:, :, 1:19] + rows[:, :, 2:]
+
+
+def features(boards):
+    """
+    Computes position features for both players across a batch of boards:
+    stones, the number of stones on the board;
+    rings, empty centers surrounded by eight of the player's stones;
+    near_rings, empty centers with seven of the player's stones around them and none of the
+    opponent's, one stone short of a ring;
+    mobility, the directions the player's movable pieces may slide in, one for each stone
+    around a footprint center that legal_start allows.
+    :param boards: N x 20 x 20 int8 array of boards
+    :return: dict of feature name to N x 2 int32 array, BLACK in column 0 and WHITE in column 1
+    """
+    black = (boards == BLACK).view(np.int8)
+    white = (boards == WHITE).view(np.int8)
+    empty_center = boards[:, 1:19, 1:19] == 0
+    result = {name: np.zeros((len(boards), 2), np.int32) for name in WEIGHTS}
+
+    for column, own, opponent in ((0, black, white), (1, white, black)):
+        own_sums, opponent_sums = box_sums(own), box_sums(opponent)
+        own_center = own[:, 1:19, 1:19]
+        result['stones'][:, column] = own.sum(axis=(1, 2), dtype=np.int32)
+        result['rings'][:, column] = ((own_sums == 8) & empty_center).sum(axis=(1, 2), dtype=np.int32)
+        near = (own_sums == 7) & (opponent_sums == 0) & empty_center
+        result['near_rings'][:, column] = near.sum(axis=(1, 2), dtype=np.int32)
+
+        # A piece holds none of the opponent's stones and is not a lone center stone.
+        pieces = (own_sums > 0) & (opponent_sums == 0) & ~((own_center == 1) & (own_sums == 1))
+        directions = (own_sums - own_center) * pieces
+        result['mobility'][:, column] = directions.sum(axis=(1, 2), dtype=np.int32)
+    return result
+
+
+def evaluate_batch(boards, turns=None, weights=None):
+    """
+    Scores a batch of positions as the weighted difference of the players' features.
+    :param boards: N x 20 x 20 int8 array of boards
+    :param turns: length N array of 1 where BLACK is to move and -1 where WHITE is, scoring for
+                  the player to move; scores are for BLACK when None
+    :param weights: dict of feature name to weight, defaults to WEIGHTS
+    :return: length N int32 array of scores
+    """
+    values = features(boards)
+    scores = np.zeros(len(boards), np.int32)
+    for name, weight in (weights or WEIGHTS).items():
+        scores += weight * (values[name][:, 0] - values[name][:, 1])
+    if turns is not None:
+        scores *= np.asarray(turns, np.int32)
+    return scores
+
+
+def evaluate_games(games, weights=None):
+    """
+    Scores games for their players to move.
+    :param games: sequence of GessGame instances
+    :param weights: dict of feature name to weight, defaults to WEIGHTS
+    :return: length N int32 array of scores
+    """
+    turns = [1 if game.get_turn() == 'BLACK' else -1 for game in games]
+    return evaluate_batch(boards_from_games(games), turns, weights)
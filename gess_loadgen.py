@@ -0,0 +1,179 @@
+# Description: Load generator for gess_server that replays games over many connections spread
+# across processes and reports moves per second and move latency percentiles.
+#
+# Games are random games played before the timed run, or games read from a gess_records file, so
+# the client spends its time sending moves rather than choosing them.
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from gess_mcts import random_move
+from gess_records import read_records
+from gess_selfplay import play_game
+from gess_server import encode_frame, read_frame
+
+
+def random_games(count, seed, max_moves=400):
+    """
+    :param count: number of games (int)
+    :param seed: random seed (int)
+    :param max_moves: moves after which a game is cut off (int)
+    :return: list of games, each a non-empty list of (start, end) alphanumeric position tuples
+    """
+    games = []
+    for i in range(count):
+        moves, game_state = play_game(random_move, random_move, random.Random('%d-%d' % (seed, i)), max_moves)
+        if moves:
+            games.append(moves)
+    return games
+
+
+def load_games(path):
+    """
+    :param path: gess_records file path (string)
+    :return: list of the file's games that have moves, each a list of (start, end) alphanumeric position tuples
+    """
+    with open(path, 'rb') as stream:
+        return [moves for moves, game_state in read_records(stream) if moves]
+
+
+async def play(host, port, games, sequences, deadline, latencies):
+    """
+    Replays games on one connection until the deadline, starting the next game of the sequences
+    when one ends, and records the time from writing each move to reading its response.
+    :param host: server address (string)
+    :param port: server port (int)
+    :param games: games played at once on this connection (int)
+    :param sequences: iterator of games to replay, each a list of moves
+    :param deadline: time.monotonic() value to stop at (float)
+    :param latencies: list receiving move round-trip times in seconds
+    :return: None
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def request(message):
+        writer.write(encode_frame(message))
+        await writer.drain()
+        return await read_frame(reader)
+
+    async def new_session():
+        response = await request({'op': 'new'})
+        return [response['game'], next(sequences), 0]
+
+    sessions = [await new_session() for i in range(games)]
+    while time.monotonic() < deadline:
+        for index, (game_id, moves, number) in enumerate(sessions):
+            if number == len(moves):
+                await request({'op': 'close', 'game': game_id})
+                sessions[index] = await new_session()
+                continue
+            xy, xy2 = moves[number]
+            message = encode_frame({'op': 'move', 'game': game_id, 'start': xy, 'end': xy2})
+            start = time.perf_counter()
+            writer.write(message)
+            await writer.drain()
+            response = await read_frame(reader)
+            latencies.append(time.perf_counter() - start)
+            if not response['ok']:
+                raise RuntimeError('server rejected ' + xy + '-' + xy2)
+            sessions[index][2] += 1
+
+    for game_id, moves, number in sessions:
+        await request({'op': 'close', 'game': game_id})
+    writer.close()
+    await writer.wait_closed()
+
+
+def run_connections(host, port, connections, games, duration, sequences):
+    """
+    Runs a process's share of the connections on its own event loop.
+    :param connections: number of connections (int)
+    :param games: games played at once on each connection (int)
+    :param duration: seconds (float)
+    :param sequences: games to replay, cycled through by every connection in turn
+    :return: (list of move round-trip times in seconds, time.time() at the start, time.time() at the end) tuple
+    """
+    async def load():
+        latencies = []
+        cycle = itertools.cycle(sequences)
+        deadline = time.monotonic() + duration
+        await asyncio.gather(*[play(host, port, games, cycle, deadline, latencies) for i in range(connections)])
+        return latencies
+
+    start = time.time()
+    latencies = asyncio.run(load())
+    return latencies, start, time.time()
+
+
+def percentile(values, fraction):
+    """
+    :param values: sorted list of numbers
+    :param fraction: 0 to 1 (float)
+    :return: value at that fraction of the list
+    """
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run(host, port, connections, games, duration, seed=0, processes=None, path=None):
+    """
+    Prepares the games to replay, runs the load with the connections spread over processes, and
+    summarizes it.
+    :param host: server address (string)
+    :param port: server port (int)
+    :param connections: number of connections (int)
+    :param games: games played at once on each connection (int)
+    :param duration: seconds (float)
+    :param seed: random seed for random games (int)
+    :param processes: number of client processes, defaults to the CPU count, at most one per connection (int)
+    :param path: gess_records file of games to replay, or None to play random games first
+    :return: dict of moves, seconds, moves_per_second, and p50, p90, p99, and max latency in milliseconds
+    """
+    processes = min(connections, processes or os.cpu_count() or 1)
+    shares = [len(range(i, connections, processes)) for i in range(processes)]
+    with ProcessPoolExecutor(processes) as executor:
+        if path is not None:
+            sequences = load_games(path)
+            if not sequences:
+                raise ValueError('no games with moves in ' + path)
+            parts = [sequences[i::processes] or sequences for i in range(processes)]
+        else:
+            parts = list(executor.map(random_games, [share * games for share in shares],
+                                      [seed + i for i in range(processes)]))
+        futures = [executor.submit(run_connections, host, port, share, games, duration, part)
+                   for share, part in zip(shares, parts)]
+        results = [future.result() for future in futures]
+
+    latencies = sorted(latency for part, start, end in results for latency in part)
+    elapsed = max(end for part, start, end in results) - min(start for part, start, end in results)
+    report = {'moves': len(latencies), 'seconds': elapsed, 'moves_per_second': len(latencies) / elapsed}
+    for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0)):
+        report[name] = percentile(latencies, fraction) * 1000 if latencies else 0.0
+    return report
+
+
+def main():
+    """
+    Parses command line options, runs the load, and prints the summary.
+    """
+    parser = argparse.ArgumentParser(description='Replay Gess games against gess_server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--connections', type=int, default=8)
+    parser.add_argument('--games', type=int, default=16, help='games per connection')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds')
+    parser.add_argument('--processes', type=int, default=None, help='client processes, defaults to the CPU count')
+    parser.add_argument('--records', help='gess_records file of games to replay instead of random games')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    report = run(args.host, args.port, args.connections, args.games, args.duration, args.seed, args.processes,
+                 args.records)
+    print('{moves} moves in {seconds:.1f}s, {moves_per_second:.0f} moves/s, latency ms p50 {p50:.2f} '
+          'p90 {p90:.2f} p99 {p99:.2f} max {max:.2f}'.format(**report))
+
+
+if __name__ == '__main__':
+    main()
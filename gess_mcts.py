@@ -0,0 +1,253 @@
+# Description: Monte Carlo Tree Search player for Gess with root parallelism across processes.
+
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from GessGame import FOOTPRINT_BITS, FOOTPRINT_MASKS, DIRECTIONS, LABELS
+from gess_engine import COORDINATES, evaluate
+
+
+def random_move(game, rng, tries=16):
+    """
+    Samples a legal move by picking a random piece, direction, and distance and trying it,
+    falling back to the full move list when no sample succeeds. The sampled move is made.
+    :param game: GessGame instance
+    :param rng: random.Random instance
+    :param tries: samples to attempt before listing every move (int)
+    :return: (start, end) alphanumeric position tuple that was made, or None if there is no legal move
+    """
+    stone = game.get_turn()[0]
+    own = game.get_bitboard(stone)
+    opponent = game.get_bitboard('W' if stone == 'B' else 'B')
+    centers = [tup for tup, mask in FOOTPRINT_MASKS.items() if own & mask and not opponent & mask]
+    for i in range(tries if centers else 0):
+        row, col = rng.choice(centers)
+        bits = FOOTPRINT_BITS[(row, col)]
+        index, d_row, d_col = rng.choice(DIRECTIONS)
+        if not own & bits[index]:
+            continue
+        distance = rng.randint(1, 17 if own & bits[4] else 3)
+        tup2 = (row + d_row * distance, col + d_col * distance)
+        if tup2 not in FOOTPRINT_MASKS:
+            continue
+        move = (LABELS[(row, col)], LABELS[tup2])
+        if game.push_move(*move):
+            return move
+
+    moves = game.generate_moves()
+    if not moves:
+        return None
+    move = rng.choice(moves)
+    game.push_move(*move)
+    return move
+
+
+def greedy_move(game, rng, samples=4):
+    """
+    Makes the sampled move capturing the most stones out of a few random legal moves.
+    :param game: GessGame instance
+    :param rng: random.Random instance
+    :param samples: random moves to compare (int)
+    :return: (start, end) alphanumeric position tuple that was made, or None if there is no legal move
+    """
+    opponent = game.get_bitboard('W' if game.get_turn() == 'BLACK' else 'B')
+    best, best_captures = None, -1
+    for i in range(samples):
+        move = random_move(game, rng)
+        if move is None:
+            return None
+        game.pop_move()
+        captures = bin(opponent & FOOTPRINT_MASKS[COORDINATES[move[1]]]).count('1')
+        if captures > best_captures:
+            best, best_captures = move, captures
+    game.push_move(*best)
+    return best
+
+
+class _Node:
+    """
+    Search tree node holding the statistics of the move that led to it.
+    """
+    __slots__ = ('move', 'parent', 'children', 'untried', 'visits', 'wins', 'player')
+
+    def __init__(self, move, parent, untried, player):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+        self.player = player
+
+
+def search_tree(game, movetime=None, iterations=None, playout_depth=10, exploration=1.4, policy='random',
+                seed=None):
+    """
+    Runs UCT search from the current position, leaving the game as it was found.
+    :param game: GessGame instance
+    :param movetime: time budget in milliseconds (int)
+    :param iterations: number of playouts, used when movetime is None (int)
+    :param playout_depth: plies played out before the position is scored (int)
+    :param exploration: UCT exploration constant (float)
+    :param policy: 'random' or 'greedy' playout moves (string)
+    :param seed: random seed (int)
+    :return: (dict of root move to visit count, number of playouts) tuple
+    """
+    rng = random.Random(seed)
+    playout = greedy_move if policy == 'greedy' else random_move
+    deadline = time.monotonic() + movetime / 1000 if movetime is not None else None
+    moves = game.generate_moves()
+    rng.shuffle(moves)
+    root = _Node(None, None, moves, game.get_turn())
+    playouts = 0
+
+    while moves:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        if deadline is None and playouts >= iterations:
+            break
+        node, depth = root, 0
+
+        # Selects the child with the best upper confidence bound until a node has untried moves.
+        while not node.untried and node.children:
+            scale = exploration * math.sqrt(math.log(node.visits))
+            node = max(node.children, key=lambda child: child.wins / child.visits +
+                       scale / math.sqrt(child.visits))
+            game.push_move(*node.move)
+            depth += 1
+
+        # Expands one untried move.
+        if node.untried:
+            player = game.get_turn()
+            move = node.untried.pop()
+            game.push_move(*move)
+            depth += 1
+            untried = game.generate_moves() if game.get_game_state() == 'UNFINISHED' else []
+            rng.shuffle(untried)
+            child = _Node(move, node, untried, player)
+            node.children.append(child)
+            node = child
+
+        # Plays out the position and scores it for BLACK.
+        for ply in range(playout_depth):
+            if game.get_game_state() != 'UNFINISHED' or playout(game, rng) is None:
+                break
+            depth += 1
+        state = game.get_game_state()
+        if state == 'BLACK_WON':
+            black = 1.0
+        elif state == 'WHITE_WON':
+            black = 0.0
+        else:
+            score = evaluate(game) / 100
+            black = 1 / (1 + math.exp(-score if game.get_turn() == 'BLACK' else score))
+        for i in range(depth):
+            game.pop_move()
+
+        # Credits each node from the view of the player who made its move.
+        while node is not None:
+            node.visits += 1
+            node.wins += black if node.player == 'BLACK' else 1 - black
+            node = node.parent
+        playouts += 1
+
+    return {child.move: child.visits for child in root.children}, playouts
+
+
+class MCTSPlayer:
+    """
+    Computer player that runs independent UCT searches from the root in several processes,
+    then plays the move with the most visits summed across them.
+    """
+    def __init__(self, movetime=1000, workers=None, playout_depth=10, exploration=1.4, policy='random', seed=None):
+        """
+        Initializes search settings and statistics. Worker processes start on the first search.
+        :param movetime: time budget per move in milliseconds (int)
+        :param workers: number of processes searching, defaults to the CPU count (int)
+        :param playout_depth: plies played out before the position is scored (int)
+        :param exploration: UCT exploration constant (float)
+        :param policy: 'random' or 'greedy' playout moves (string)
+        :param seed: random seed (int)
+        """
+        self._movetime = movetime
+        self._workers = workers or os.cpu_count() or 1
+        self._playout_depth = playout_depth
+        self._exploration = exploration
+        self._policy = policy
+        self._rng = random.Random(seed)
+        self._executor = None
+        self._playouts = 0
+        self._elapsed = 0.0
+        self._visits = {}
+
+    def get_playouts(self):
+        """
+        :return: playouts run by the last search across all workers (int)
+        """
+        return self._playouts
+
+    def get_pps(self):
+        """
+        :return: playouts per second of the last search (int)
+        """
+        if self._elapsed == 0:
+            return 0
+        return int(self._playouts / self._elapsed)
+
+    def get_visits(self):
+        """
+        :return: merged visit counts of the root moves from the last search (dict)
+        """
+        return self._visits
+
+    def choose_move(self, game):
+        """
+        Picks a move for the player to move within the player's time budget.
+        :param game: GessGame instance
+        :return: (start, end) alphanumeric position tuple, or None if there is no legal move
+        """
+        return self.search(game)
+
+    def search(self, game, movetime=None, iterations=None):
+        """
+        Searches from the current position in every worker and merges root visit counts.
+        :param game: GessGame instance
+        :param movetime: time budget in milliseconds, defaults to the player's (int)
+        :param iterations: playouts per worker, used instead of a time budget when given (int)
+        :return: (start, end) alphanumeric position tuple, or None if there is no legal move
+        """
+        if iterations is None and movetime is None:
+            movetime = self._movetime
+        start = time.monotonic()
+        settings = (movetime, iterations, self._playout_depth, self._exploration, self._policy)
+        seeds = [self._rng.getrandbits(32) for i in range(self._workers)]
+
+        if self._workers == 1:
+            results = [search_tree(game, *settings, seed=seeds[0])]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self._workers)
+            futures = [self._executor.submit(search_tree, game, *settings, seed=seed) for seed in seeds]
+            results = [future.result() for future in futures]
+
+        self._visits = {}
+        self._playouts = 0
+        for visits, playouts in results:
+            self._playouts += playouts
+            for move, count in visits.items():
+                self._visits[move] = self._visits.get(move, 0) + count
+        self._elapsed = time.monotonic() - start
+        if not self._visits:
+            return None
+        return max(self._visits, key=self._visits.get)
+
+    def close(self):
+        """
+        Shuts down the worker processes.
+        :return: None
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,90 @@
+# Description: Perft node counts of the Gess legal move tree for checking and timing the rules engine.
+
+import argparse
+import time
+from GessGame import GessGame
+
+# Saved positions, each reached by playing its moves from the initial layout.
+POSITIONS = {
+    'start': [],
+    'opening': [('c3', 'c5'), ('r18', 'r15')],
+    'diagonals': [('c3', 'b3'), ('c18', 'b18'), ('f3', 'c6'), ('F18', 'c15'), ('f8', 'f5'), ('f13', 'f15'),
+                  ('c6', 'J13'), ('c15', 'j8')],
+    'ring_attack': [('m7', 'k7'), ('m14', 'K14'), ('l3', 'l6'), ('l18', 'l15'), ('l6', 'l9'), ('l15', 'l13')],
+}
+
+
+def load_position(name):
+    """
+    Plays a saved position's moves on a new game.
+    :param name: key of POSITIONS (string)
+    :return: GessGame instance
+    """
+    game = GessGame()
+    for xy, xy2 in POSITIONS[name]:
+        if not game.make_move(xy, xy2):
+            raise ValueError('Illegal move in saved position ' + name + ': ' + xy + '-' + xy2)
+    return game
+
+
+def perft(game, depth):
+    """
+    Counts the leaf nodes of the legal move tree below the current position.
+    :param game: GessGame instance, left as it was found
+    :param depth: plies to search (int)
+    :return: number of positions at the given depth (int)
+    """
+    if depth == 0:
+        return 1
+    moves = game.generate_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        game.push_move(*move)
+        nodes += perft(game, depth-1)
+        game.pop_move()
+    return nodes
+
+
+def divide(game, depth):
+    """
+    Counts the leaf nodes below each legal move, for finding where two move generators disagree.
+    :param game: GessGame instance, left as it was found
+    :param depth: plies to search, including the first move (int)
+    :return: dict of (start, end) move to number of positions
+    """
+    counts = {}
+    for move in game.generate_moves():
+        game.push_move(*move)
+        counts[move] = perft(game, depth-1)
+        game.pop_move()
+    return counts
+
+
+def main():
+    """
+    Prints perft counts and nodes per second for saved positions up to the given depth.
+    """
+    parser = argparse.ArgumentParser(description='Count Gess move tree leaf nodes.')
+    parser.add_argument('depth', type=int, nargs='?', default=2, help='deepest ply to count')
+    parser.add_argument('--position', choices=sorted(POSITIONS), action='append',
+                        help='saved position to count from, may be repeated (default: all)')
+    parser.add_argument('--divide', action='store_true', help='print counts below each first move')
+    args = parser.parse_args()
+
+    for name in args.position or POSITIONS:
+        game = load_position(name)
+        if args.divide:
+            for (xy, xy2), nodes in sorted(divide(game, args.depth).items()):
+                print(xy + '-' + xy2, nodes)
+        for depth in range(1, args.depth + 1):
+            start = time.perf_counter()
+            nodes = perft(game, depth)
+            elapsed = time.perf_counter() - start
+            print('{} depth {} nodes {} time {:.3f}s nps {}'.format(
+                name, depth, nodes, elapsed, int(nodes / elapsed) if elapsed else 0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+# Description: Line-based engine protocol over stdin/stdout, modeled on UCI, for driving the
+# Gess engine from external front ends and tournament managers.
+#
+# Commands:
+#   gess                               identify the engine, answered with gessok
+#   isready                            answered with readyok, even while searching
+#   newgame                            start a new game and clear the search tables
+#   position startpos [moves c3-c5 ...]
+#   moves                              list the legal moves in the current position
+#   go [movetime ms | depth n | infinite]
+#   stop                               end the search, which answers with bestmove
+#   quit
+
+import sys
+import threading
+from GessGame import GessGame
+from gess_engine import GessEngine
+
+# Search budget for 'go infinite' and 'go depth', ended by 'stop'.
+INFINITE = 10 ** 9
+
+
+def format_move(move):
+    """
+    :param move: (start, end) alphanumeric position tuple
+    :return: move in protocol notation, such as 'C3-C5' (string)
+    """
+    return move[0] + '-' + move[1]
+
+
+class EngineProtocol:
+    """
+    Reads protocol commands one line at a time and writes responses, running searches in a
+    background thread so 'stop' and 'isready' are answered while the engine is thinking. Commands
+    that change or read the position stop a search in progress first.
+    """
+    def __init__(self, engine=None, output=None):
+        """
+        Initializes the engine, the game being analyzed, and the output stream.
+        :param engine: GessEngine instance, defaults to a new engine
+        :param output: writable text stream, defaults to sys.stdout
+        """
+        self._engine = engine or GessEngine()
+        self._output = output or sys.stdout
+        self._game = GessGame()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def send(self, line):
+        """
+        Writes one response line and flushes it so the front end sees it at once.
+        :param line: response (string)
+        :return: None
+        """
+        with self._lock:
+            self._output.write(line + '\n')
+            self._output.flush()
+
+    def run(self, stream=None):
+        """
+        Handles commands until 'quit' or the end of input, then waits for any search to finish.
+        :param stream: readable text stream, defaults to sys.stdin
+        :return: None
+        """
+        for line in stream or sys.stdin:
+            if not self.handle(line):
+                break
+        self.wait()
+
+    def wait(self):
+        """
+        Waits for a search in progress to send its best move.
+        :return: None
+        """
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stop_search(self):
+        """
+        Ends a search in progress and waits for it to send its best move.
+        :return: None
+        """
+        self._engine.stop()
+        self.wait()
+
+    def handle(self, line):
+        """
+        Carries out one command. Unknown commands are reported and ignored.
+        :param line: command line (string)
+        :return: False if the command was 'quit', else True
+        """
+        words = line.split()
+        if not words:
+            return True
+        command, args = words[0].lower(), words[1:]
+
+        if command == 'quit':
+            self._engine.stop()
+            return False
+        if command == 'stop':
+            self.stop_search()
+        elif command == 'isready':
+            self.send('readyok')
+        elif command == 'gess':
+            self.send('id name GessEngine')
+            self.send('gessok')
+        elif command == 'newgame':
+            self.stop_search()
+            self._engine = GessEngine()
+            self._game = GessGame()
+        elif command == 'position':
+            self.stop_search()
+            self.position(args)
+        elif command == 'moves':
+            self.stop_search()
+            self.send('moves ' + ' '.join(format_move(move) for move in self._game.generate_moves()))
+        elif command == 'go':
+            self.stop_search()
+            self.go(args)
+        else:
+            self.send('info string unknown command ' + command)
+        return True
+
+    def position(self, args):
+        """
+        Sets up the starting layout and plays the listed moves.
+        :param args: 'startpos', optionally followed by 'moves' and moves such as 'c3-c5' (list of strings)
+        :return: None
+        """
+        game = GessGame()
+        if args[:1] != ['startpos']:
+            self.send('info string position must start with startpos')
+            return
+        for move in args[2:] if args[1:2] == ['moves'] else []:
+            xy, sep, xy2 = move.partition('-')
+            if not xy or not xy2 or not game.make_move(xy, xy2):
+                self.send('info string illegal move ' + move)
+                return
+        self._game = game
+
+    def go(self, args):
+        """
+        Starts a search of the current position in a background thread.
+        :param args: 'movetime' and milliseconds, 'depth' and plies, or 'infinite' (list of strings)
+        :return: None
+        """
+        movetime, max_depth = INFINITE, None
+        try:
+            if args[:1] == ['movetime']:
+                movetime = int(args[1])
+            elif args[:1] == ['depth']:
+                max_depth = int(args[1])
+        except (IndexError, ValueError):
+            self.send('info string go expects movetime or depth and a number')
+            return
+
+        # Cleared here rather than in the thread, so a 'stop' sent right after 'go' is not lost.
+        self._engine.clear_stop()
+        self._thread = threading.Thread(target=self.search, args=(movetime, max_depth), daemon=True)
+        self._thread.start()
+
+    def search(self, movetime, max_depth):
+        """
+        Searches the current position, streaming an info line per completed depth, then sends the best move.
+        :param movetime: time budget in milliseconds (int)
+        :param max_depth: deepest iteration to search, or None for the engine's limit (int)
+        :return: None
+        """
+        move = self._engine.search(self._game, movetime, max_depth, info=self.info, clear_stop=False)
+        self.send('info nodes {} nps {}'.format(self._engine.get_nodes(), self._engine.get_nps()))
+        self.send('bestmove ' + (format_move(move) if move is not None else 'none'))
+
+    def info(self, report):
+        """
+        Sends an engine search report.
+        :param report: dict of depth, score, nodes, nps, time, and pv
+        :return: None
+        """
+        self.send('info depth {depth} score {score} nodes {nodes} nps {nps} time {time} pv '.format(**report) +
+                  ' '.join(format_move(move) for move in report['pv']))
+
+
+def main():
+    """
+    Runs the engine protocol on stdin and stdout.
+    """
+    EngineProtocol().run()
+
+
+if __name__ == '__main__':
+    main()
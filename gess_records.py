@@ -0,0 +1,313 @@
+# Description: Compact binary game records with streaming reading and writing, and memory-mapped
+# archives for random access by game index.
+#
+# A record file starts with an 8-byte header: b'GESS', a format version byte, and 3 reserved bytes.
+# Each game record follows as a 4-byte header, holding the number of moves (2 bytes) and the game
+# state (1 byte, as in gess_state.STATES) and a reserved byte, then 2 bytes per move. All integers
+# are big-endian. A move is encoded from its start center and the direction and distance it slides:
+#   start * 136 + direction * 17 + distance - 1
+# where start numbers the 324 piece centers row by row (B2 = 0, C2 = 1, ..., S19 = 323), direction
+# is the index into GessGame.DIRECTIONS (0 NW ... 7 SE), and distance is 1-17.
+#
+# A file may end with an index for random access: 4 bytes of 0xff, which no record header can
+# hold, then each record's offset (8 bytes each), then a 20-byte trailer of the record count, the
+# offset of the 0xff marker, and b'GIDX'.
+
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+from GessGame import DIRECTIONS, FOOTPRINT_MASKS, LABELS, validate_moves
+from gess_state import STATES
+
+MAGIC = b'GESS'
+VERSION = 1
+FILE_HEADER = struct.Struct('>4sB3x')
+RECORD_HEADER = struct.Struct('>HBx')
+INDEX_MARKER = b'\xff\xff\xff\xff'
+INDEX_MAGIC = b'GIDX'
+TRAILER = struct.Struct('>QQ4s')
+OFFSET = struct.Struct('>Q')
+
+# Piece centers in encoding order.
+CENTER_LIST = sorted(FOOTPRINT_MASKS)
+
+
+def _move_tables():
+    """
+    :return: (list of every move by code, with None for codes sliding off the board,
+              dict of every code by move in upper and lower case) tuple
+    """
+    moves, codes = [], {}
+    for row, col in CENTER_LIST:
+        for index, d_row, d_col in DIRECTIONS:
+            for distance in range(1, 18):
+                tup2 = (row + d_row * distance, col + d_col * distance)
+                if tup2 not in FOOTPRINT_MASKS:
+                    moves.extend([None] * (18 - distance))
+                    break
+                xy, xy2 = LABELS[(row, col)], LABELS[tup2]
+                codes[(xy, xy2)] = codes[(xy.lower(), xy2.lower())] = len(moves)
+                moves.append((xy, xy2))
+    return moves, codes
+
+
+MOVES, MOVE_CODES = _move_tables()
+
+
+def encode_move(xy, xy2):
+    """
+    :param xy: center position of starting piece, such as 'C3' or 'c3' (string)
+    :param xy2: center position of ending piece (string)
+    :return: 2-byte move code (int)
+    :raises ValueError: if the positions are not piece centers on one row, column, or diagonal
+    """
+    code = MOVE_CODES.get((xy, xy2))
+    if code is None and isinstance(xy, str) and isinstance(xy2, str):
+        code = MOVE_CODES.get((xy.upper(), xy2.upper()))
+    if code is None:
+        raise ValueError('not a sliding move between piece centers: ' + str(xy) + '-' + str(xy2))
+    return code
+
+
+def decode_move(code):
+    """
+    :param code: 2-byte move code (int)
+    :return: (start, end) alphanumeric position tuple
+    :raises ValueError: if the code does not describe a move between piece centers
+    """
+    move = MOVES[code] if 0 <= code < len(MOVES) else None
+    if move is None:
+        raise ValueError('bad move code ' + str(code))
+    return move
+
+
+def encode_record(moves, game_state='UNFINISHED'):
+    """
+    :param moves: sequence of (start, end) center position pairs (strings)
+    :param game_state: 'UNFINISHED', 'BLACK_WON', or 'WHITE_WON' (string)
+    :return: record header and move codes (bytes)
+    :raises ValueError: if a move cannot be encoded or there are more than 65535 moves
+    """
+    codes = [encode_move(xy, xy2) for xy, xy2 in moves]
+    if len(codes) > 0xffff:
+        raise ValueError('a record holds at most 65535 moves')
+    return RECORD_HEADER.pack(len(codes), STATES.index(game_state)) + struct.pack('>%dH' % len(codes), *codes)
+
+
+def decode_moves(data):
+    """
+    :param data: 2 bytes per move (bytes-like)
+    :return: list of (start, end) alphanumeric position tuples
+    """
+    moves = [MOVES[code] if code < len(MOVES) else None for code in struct.unpack('>%dH' % (len(data) // 2), data)]
+    if None in moves:
+        raise ValueError('bad move code in record')
+    return moves
+
+
+def decode_state(state):
+    """
+    :param state: game state byte of a record header (int)
+    :return: 'UNFINISHED', 'BLACK_WON', or 'WHITE_WON' (string)
+    :raises ValueError: if the byte is not a game state
+    """
+    if state >= len(STATES):
+        raise ValueError('bad game state in record')
+    return STATES[state]
+
+
+def write_records(stream, records, index=False):
+    """
+    Writes records from an iterable as they arrive, so generators of any length use bounded memory.
+    Record offsets are kept only when an index is written, at 8 bytes per record.
+    :param stream: binary file opened for writing
+    :param records: iterable of (moves, game state) pairs, as yielded by read_records
+    :param index: also writes the index read by RecordArchive (bool)
+    :return: number of records written (int)
+    """
+    offsets = array('Q') if index else None
+    count = 0
+    offset = stream.write(FILE_HEADER.pack(MAGIC, VERSION))
+    for moves, game_state in records:
+        if index:
+            offsets.append(offset)
+        offset += stream.write(encode_record(moves, game_state))
+        count += 1
+    if index:
+        write_index(stream, offsets, offset)
+    return count
+
+
+def write_index(stream, offsets, offset):
+    """
+    Writes the index and trailer after the last record.
+    :param stream: binary file opened for writing, positioned after the last record
+    :param offsets: offset of each record (array of ints)
+    :param offset: position of the end of the last record (int)
+    :return: None
+    """
+    stream.write(INDEX_MARKER)
+    if sys.byteorder == 'little':
+        offsets = array('Q', offsets)
+        offsets.byteswap()
+    stream.write(offsets.tobytes())
+    stream.write(TRAILER.pack(len(offsets), offset, INDEX_MAGIC))
+
+
+def read_header(data):
+    """
+    :param data: the first FILE_HEADER.size bytes of a record file (bytes-like)
+    :raises ValueError: if the data is not a record file header of a known version
+    """
+    if len(data) < FILE_HEADER.size:
+        raise ValueError('missing record file header')
+    magic, version = FILE_HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('not a version ' + str(VERSION) + ' Gess record file')
+
+
+def read_records(stream):
+    """
+    Reads records one at a time, holding only the current record in memory.
+    :param stream: binary file opened for reading
+    :return: generator of (list of (start, end) alphanumeric position tuples, game state) pairs
+    :raises ValueError: if the file is not a record file or a record is cut short or corrupt
+    """
+    read_header(stream.read(FILE_HEADER.size))
+    while True:
+        header = stream.read(RECORD_HEADER.size)
+        if not header or header == INDEX_MARKER:
+            return
+        if len(header) < RECORD_HEADER.size:
+            raise ValueError('record header cut short')
+        count, state = RECORD_HEADER.unpack(header)
+        data = stream.read(2 * count)
+        if len(data) < 2 * count:
+            raise ValueError('record moves cut short')
+        yield decode_moves(data), decode_state(state)
+
+
+class RecordArchive:
+    """
+    Memory-maps a record file for random access by game index. Uses the file's index when it has
+    one, and otherwise finds the record offsets with one pass over the record headers.
+    """
+    def __init__(self, path):
+        """
+        Opens and maps the file and loads the record offsets.
+        :param path: record file path (string)
+        :raises ValueError: if the file is not a record file
+        """
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        read_header(self._map[:FILE_HEADER.size])
+        self._count, self._index = self.read_trailer()
+        if self._index is None:
+            self._offsets = self.scan()
+            self._count = len(self._offsets)
+
+    def __len__(self):
+        """
+        :return: number of records (int)
+        """
+        return self._count
+
+    def __enter__(self):
+        """
+        :return: the archive, closed when the with block ends
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Closes the archive.
+        """
+        self.close()
+
+    def read_trailer(self):
+        """
+        :return: (record count, offset of the index offsets) tuple, or (0, None) without an index
+        """
+        size = len(self._map)
+        if size < FILE_HEADER.size + len(INDEX_MARKER) + TRAILER.size:
+            return 0, None
+        count, offset, magic = TRAILER.unpack_from(self._map, size - TRAILER.size)
+        if magic != INDEX_MAGIC or self._map[offset:offset + len(INDEX_MARKER)] != INDEX_MARKER:
+            return 0, None
+        return count, offset + len(INDEX_MARKER)
+
+    def scan(self):
+        """
+        Finds the offset of each record from the record headers.
+        :return: record offsets (array of ints)
+        """
+        offsets = array('Q')
+        offset, size = FILE_HEADER.size, len(self._map)
+        while offset + RECORD_HEADER.size <= size and self._map[offset:offset + 4] != INDEX_MARKER:
+            offsets.append(offset)
+            count, state = RECORD_HEADER.unpack_from(self._map, offset)
+            offset += RECORD_HEADER.size + 2 * count
+        return offsets
+
+    def get_offset(self, index):
+        """
+        :param index: record number (int)
+        :return: position of the record in the file (int)
+        """
+        if not 0 <= index < self._count:
+            raise IndexError('record ' + str(index) + ' out of range')
+        if self._index is None:
+            return self._offsets[index]
+        return OFFSET.unpack_from(self._map, self._index + 8 * index)[0]
+
+    def get_record(self, index):
+        """
+        :param index: record number (int)
+        :return: (list of (start, end) alphanumeric position tuples, game state) pair
+        """
+        offset = self.get_offset(index)
+        count, state = RECORD_HEADER.unpack_from(self._map, offset)
+        start = offset + RECORD_HEADER.size
+        return decode_moves(self._map[start:start + 2 * count]), decode_state(state)
+
+    def __getitem__(self, index):
+        """
+        :param index: record number, negative from the end (int)
+        :return: (moves, game state) pair as returned by get_record
+        """
+        return self.get_record(index + self._count if index < 0 else index)
+
+    def close(self):
+        """
+        Unmaps and closes the file.
+        :return: None
+        """
+        self._map.close()
+        self._file.close()
+
+
+def main():
+    """
+    Prints the number of games and moves in a record file, and optionally checks every move.
+    """
+    parser = argparse.ArgumentParser(description='Summarize a Gess record file.')
+    parser.add_argument('path')
+    parser.add_argument('--validate', action='store_true', help='replay every game and report illegal moves')
+    args = parser.parse_args()
+
+    games = moves = 0
+    with open(args.path, 'rb') as stream:
+        for record, game_state in read_records(stream):
+            if args.validate:
+                index = validate_moves(record)
+                if index is not None:
+                    print('game', games, 'illegal move', index, '-'.join(record[index]))
+            games += 1
+            moves += len(record)
+    print(games, 'games', moves, 'moves')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+# Description: Plays many Gess games between computer players across a process pool, streaming
+# finished games to a gess_records file and reporting throughput.
+#
+# Game i is played with random.Random('<seed>-<i>'), so random and greedy games are the same for a
+# seed whatever the number of workers, and games are written in order of i.
+
+import argparse
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from GessGame import GessGame
+from gess_engine import GessEngine
+from gess_mcts import MCTSPlayer, random_move, greedy_move
+from gess_records import write_records
+
+PLAYERS = ('random', 'greedy', 'engine', 'mcts')
+
+
+def make_player(name, movetime):
+    """
+    :param name: one of PLAYERS (string)
+    :param movetime: time budget per move in milliseconds for engine and mcts players (int)
+    :return: function making a move in a game with a random.Random instance, returning the
+             (start, end) alphanumeric position tuple made, or None if there is no legal move
+    """
+    if name == 'random':
+        return random_move
+    if name == 'greedy':
+        return greedy_move
+    engine = GessEngine(movetime) if name == 'engine' else MCTSPlayer(movetime, workers=1)
+
+    def engine_move(game, rng):
+        move = engine.choose_move(game)
+        if move is not None:
+            game.make_move(*move)
+        return move
+    return engine_move
+
+
+def play_game(black, white, rng, max_moves):
+    """
+    Plays one game from the initial layout. A player without a legal move loses.
+    :param black: BLACK's move function, as returned by make_player
+    :param white: WHITE's move function
+    :param rng: random.Random instance
+    :param max_moves: moves after which the game is left unfinished (int)
+    :return: (list of (start, end) alphanumeric position tuples, game state) pair
+    """
+    game, moves = GessGame(), []
+    while game.get_game_state() == 'UNFINISHED' and len(moves) < max_moves:
+        move = (black if game.get_turn() == 'BLACK' else white)(game, rng)
+        if move is None:
+            game.resign_game()
+            break
+        moves.append(move)
+    return moves, game.get_game_state()
+
+
+def play_batch(first, count, black, white, movetime, seed, max_moves):
+    """
+    Plays a run of consecutive games in a worker process.
+    :param first: number of the first game (int)
+    :param count: number of games (int)
+    :param black: BLACK player name (string)
+    :param white: WHITE player name (string)
+    :param movetime: time budget per move in milliseconds for engine and mcts players (int)
+    :param seed: seed of the whole run (int)
+    :param max_moves: moves after which a game is left unfinished (int)
+    :return: (list of (moves, game state) pairs, worker process id, seconds spent playing) tuple
+    """
+    start = time.perf_counter()
+    players = make_player(black, movetime), make_player(white, movetime)
+    records = [play_game(*players, random.Random('%d-%d' % (seed, i)), max_moves)
+               for i in range(first, first + count)]
+    return records, os.getpid(), time.perf_counter() - start
+
+
+def run(path, games, black='random', white='random', workers=None, batch=64, movetime=50, seed=0,
+        max_moves=400):
+    """
+    Plays games across worker processes and writes each batch to the record file in game order as
+    soon as it and every batch before it are finished. At most two batches per worker are queued.
+    :param path: record file path (string)
+    :param games: number of games (int)
+    :param black: BLACK player name, one of PLAYERS (string)
+    :param white: WHITE player name, one of PLAYERS (string)
+    :param workers: number of processes, defaults to the CPU count (int)
+    :param batch: games handed to a worker at a time (int)
+    :param movetime: time budget per move in milliseconds for engine and mcts players (int)
+    :param seed: seed of the whole run (int)
+    :param max_moves: moves after which a game is left unfinished (int)
+    :return: dict of games, moves, seconds, games_per_second, moves_per_second, results (game
+             state counts), and utilization (fraction of the run each worker process spent playing)
+    """
+    for name in (black, white):
+        if name not in PLAYERS:
+            raise ValueError('unknown player ' + str(name))
+    workers = workers or os.cpu_count() or 1
+    report = {'games': 0, 'moves': 0, 'results': {}}
+    busy = {}
+    start = time.monotonic()
+
+    def finished():
+        settings = (black, white, movetime, seed, max_moves)
+        with ProcessPoolExecutor(workers) as executor:
+            pending, first = deque(), 0
+            while first < games or pending:
+                while first < games and len(pending) < 2 * workers:
+                    count = min(batch, games - first)
+                    pending.append(executor.submit(play_batch, first, count, *settings))
+                    first += count
+                records, pid, seconds = pending.popleft().result()
+                busy[pid] = busy.get(pid, 0.0) + seconds
+                for moves, game_state in records:
+                    report['games'] += 1
+                    report['moves'] += len(moves)
+                    report['results'][game_state] = report['results'].get(game_state, 0) + 1
+                    yield moves, game_state
+
+    with open(path, 'wb') as stream:
+        write_records(stream, finished(), index=True)
+    elapsed = time.monotonic() - start
+    report['seconds'] = elapsed
+    report['games_per_second'] = report['games'] / elapsed
+    report['moves_per_second'] = report['moves'] / elapsed
+    report['utilization'] = {pid: seconds / elapsed for pid, seconds in sorted(busy.items())}
+    return report
+
+
+def main():
+    """
+    Parses command line options, plays the games, and prints the summary.
+    """
+    parser = argparse.ArgumentParser(description='Play Gess games between computer players in parallel.')
+    parser.add_argument('path', help='record file to write')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--black', choices=PLAYERS, default='random')
+    parser.add_argument('--white', choices=PLAYERS, default='random')
+    parser.add_argument('--workers', type=int, default=None, help='defaults to the CPU count')
+    parser.add_argument('--batch', type=int, default=64, help='games per worker task')
+    parser.add_argument('--movetime', type=int, default=50, help='milliseconds per engine or mcts move')
+    parser.add_argument('--max-moves', type=int, default=400, help='moves before a game is left unfinished')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    report = run(args.path, args.games, args.black, args.white, args.workers, args.batch, args.movetime,
+                 args.seed, args.max_moves)
+    print('{games} games, {moves} moves in {seconds:.1f}s, {games_per_second:.1f} games/s, '
+          '{moves_per_second:.0f} moves/s'.format(**report))
+    print('results', ', '.join(state + ' ' + str(count) for state, count in sorted(report['results'].items())))
+    for pid, fraction in report['utilization'].items():
+        print('worker', pid, 'busy {:.0%}'.format(fraction))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+# Description: asyncio server hosting many concurrent Gess games over a framed JSON protocol.
+#
+# Each frame is a 4-byte big-endian length followed by a UTF-8 JSON object. Requests name an
+# operation and may carry an 'id' that is echoed in the response so clients can pipeline:
+#   {"op": "new"}                                      -> {"ok": true, "game": 1, "turn": "BLACK"}
+#   {"op": "move", "game": 1, "start": "c3", "end": "c5"} -> {"ok": true, "turn": ..., "state": ...}
+#   {"op": "moves", "game": 1}                          -> {"ok": true, "moves": [["C3", "C4"], ...]}
+#   {"op": "state", "game": 1}                          -> {"ok": true, "turn": ..., "state": ..., "board": [...]}
+#   {"op": "resign", "game": 1}                         -> {"ok": true, "state": ...}
+#   {"op": "close", "game": 1}                          -> {"ok": true}
+
+import argparse
+import asyncio
+import json
+import pickle
+import struct
+from GessGame import GessGame
+
+# Largest frame accepted, in bytes.
+MAX_FRAME = 1 << 16
+
+
+def encode_frame(message):
+    """
+    :param message: JSON-serializable dict
+    :return: length-prefixed frame (bytes)
+    """
+    payload = json.dumps(message, separators=(',', ':')).encode()
+    return struct.pack('>I', len(payload)) + payload
+
+
+async def read_frame(reader):
+    """
+    Reads one frame.
+    :param reader: asyncio.StreamReader
+    :return: decoded message (dict), or None at the end of the stream
+    :raises ValueError: if the frame is larger than MAX_FRAME or not valid JSON
+    """
+    try:
+        header = await reader.readexactly(4)
+    except asyncio.IncompleteReadError:
+        return None
+    size, = struct.unpack('>I', header)
+    if size > MAX_FRAME:
+        raise ValueError('frame of ' + str(size) + ' bytes is too large')
+    try:
+        payload = await reader.readexactly(size)
+    except asyncio.IncompleteReadError:
+        return None
+    return json.loads(payload)
+
+
+def generate_moves(snapshot):
+    """
+    Lists the legal moves of a pickled game, so the game can be copied to an executor.
+    :param snapshot: pickled GessGame (bytes)
+    :return: list of (start, end) alphanumeric position tuples
+    """
+    return pickle.loads(snapshot).generate_moves()
+
+
+class GessServer:
+    """
+    Hosts GessGame sessions shared by all connections. A game is dropped when it is closed or when
+    the connection that created it ends. Requests on one connection are handled in order, and the
+    next request is not read until the last response has drained, so a slow client holds back
+    only itself. Moves take microseconds and are applied directly on the event loop. Move lists
+    take milliseconds, so they are generated from a copy of the game in an executor and cached
+    by position hash until the game moves on.
+    """
+    def __init__(self, max_sessions=100000, executor=None):
+        """
+        Initializes the session table and counters.
+        :param max_sessions: most games hosted at once (int)
+        :param executor: concurrent.futures executor generating move lists, defaults to the
+                         event loop's default executor
+        """
+        self._sessions = {}
+        self._legal_moves = {}
+        self._executor = executor
+        self._next_id = 1
+        self._max_sessions = max_sessions
+        self._moves = 0
+
+    def get_session_count(self):
+        """
+        :return: number of games being hosted (int)
+        """
+        return len(self._sessions)
+
+    def get_move_count(self):
+        """
+        :return: number of legal moves applied since the server started (int)
+        """
+        return self._moves
+
+    async def start(self, host='127.0.0.1', port=8765, reuse_port=False):
+        """
+        Starts listening for connections.
+        :param host: address to listen on (string)
+        :param port: TCP port, 0 for any free port (int)
+        :param reuse_port: lets several server processes share the port, one per core (bool)
+        :return: asyncio.Server
+        """
+        return await asyncio.start_server(self.handle_client, host, port, reuse_port=reuse_port or None)
+
+    async def handle_client(self, reader, writer):
+        """
+        Answers a connection's requests until it closes or sends a malformed frame.
+        :param reader: asyncio.StreamReader
+        :param writer: asyncio.StreamWriter
+        :return: None
+        """
+        games = set()
+        try:
+            while True:
+                try:
+                    request = await read_frame(reader)
+                except ValueError as error:
+                    writer.write(encode_frame({'ok': False, 'error': str(error)}))
+                    break
+                if request is None:
+                    break
+                writer.write(encode_frame(await self.handle(request, games)))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for game_id in games:
+                self._sessions.pop(game_id, None)
+                self._legal_moves.pop(game_id, None)
+            writer.close()
+
+    async def legal_moves(self, game_id, game):
+        """
+        Finds a game's legal moves, reusing the cached list while the position is unchanged.
+        :param game_id: id of the game (int)
+        :param game: GessGame instance
+        :return: list of (start, end) alphanumeric position tuples
+        """
+        position = game.get_hash()
+        cached = self._legal_moves.get(game_id)
+        if cached is not None and cached[0] == position:
+            return cached[1]
+        loop = asyncio.get_running_loop()
+        moves = await loop.run_in_executor(self._executor, generate_moves, pickle.dumps(game))
+        if game_id in self._sessions:
+            self._legal_moves[game_id] = (position, moves)
+        return moves
+
+    async def handle(self, request, games=None):
+        """
+        Carries out one request.
+        :param request: decoded request (dict)
+        :param games: ids of the games created on the requesting connection, updated by 'new' and 'close' (set)
+        :return: response (dict)
+        """
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': 'request must be an object'}
+        op = request.get('op')
+        response = {'id': request['id']} if 'id' in request else {}
+
+        if op == 'new':
+            if len(self._sessions) >= self._max_sessions:
+                response.update(ok=False, error='server is full')
+                return response
+            game_id = self._next_id
+            self._next_id += 1
+            self._sessions[game_id] = GessGame()
+            if games is not None:
+                games.add(game_id)
+            response.update(ok=True, game=game_id, turn='BLACK')
+            return response
+
+        game_id = request.get('game')
+        game = self._sessions.get(game_id) if isinstance(game_id, int) else None
+        if game is None:
+            response.update(ok=False, error='no such game')
+        elif op == 'move':
+            start, end = request.get('start'), request.get('end')
+            if not isinstance(start, str) or not isinstance(end, str) or not start or not end:
+                response.update(ok=False, error='move needs start and end positions')
+                return response
+            legal = game.make_move(start, end)
+            self._moves += legal
+            response.update(ok=legal, turn=game.get_turn(), state=game.get_game_state())
+        elif op == 'moves':
+            response.update(ok=True, moves=await self.legal_moves(game_id, game))
+        elif op == 'state':
+            response.update(ok=True, turn=game.get_turn(), state=game.get_game_state(),
+                            board=[''.join(row) for row in game.get_board()[1:]])
+        elif op == 'resign':
+            response.update(ok=True, state=game.resign_game())
+        elif op == 'close':
+            del self._sessions[game_id]
+            self._legal_moves.pop(game_id, None)
+            if games is not None:
+                games.discard(game_id)
+            response.update(ok=True)
+        else:
+            response.update(ok=False, error='unknown op')
+        return response
+
+
+async def serve(host, port, reuse_port):
+    """
+    Runs a server until interrupted.
+    """
+    server = await GessServer().start(host, port, reuse_port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """
+    Parses command line options and runs the server.
+    """
+    parser = argparse.ArgumentParser(description='Host Gess games over a framed JSON protocol.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--reuse-port', action='store_true', help='share the port with other server processes')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.reuse_port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+# Description: Compact snapshot of a Gess game for holding many idle sessions in memory.
+
+import tracemalloc
+from GessGame import GessGame, LABELS
+
+# Stone characters by cell value, and the small ints stored for the turn and game state.
+STONES = ' BW'
+TURNS = ('BLACK', 'WHITE')
+STATES = ('UNFINISHED', 'BLACK_WON', 'WHITE_WON')
+
+
+class GessState:
+    """
+    Stores a game position in a 400-byte bytearray, one cell per square in bitboard order
+    (0 empty, 1 BLACK, 2 WHITE), with the turn and game state as small ints. Board and position
+    adapters rebuild the GessBoard forms on request, and to_game restores a playable GessGame.
+    """
+    __slots__ = ('_cells', '_turn', '_game_state')
+
+    def __init__(self, game=None):
+        """
+        Packs a game's stones, turn, and game state.
+        :param game: GessGame instance, defaults to a new game
+        """
+        if game is None:
+            game = GessGame()
+        self._cells = bytearray(400)
+        for value in (1, 2):
+            stones = game.get_bitboard(STONES[value])
+            while stones:
+                bit = stones & -stones
+                stones ^= bit
+                self._cells[bit.bit_length()-1] = value
+        self._turn = TURNS.index(game.get_turn())
+        self._game_state = STATES.index(game.get_game_state())
+
+    def get_turn(self):
+        """
+        :return: current player turn (string)
+        """
+        return TURNS[self._turn]
+
+    def get_game_state(self):
+        """
+        :return: current game state (string)
+        """
+        return STATES[self._game_state]
+
+    def get_cells(self):
+        """
+        :return: cell values in bitboard order (bytearray)
+        """
+        return self._cells
+
+    def get_bitboard(self, player):
+        """
+        :param player: 'B' or 'W' (string)
+        :return: bitboard of the player's stones (int)
+        """
+        value = STONES.index(player)
+        return sum(1 << index for index, cell in enumerate(self._cells) if cell == value)
+
+    def get_board(self):
+        """
+        :return: game board in the GessBoard layout, 21 rows of 20 with row 0 unused (list of lists)
+        """
+        board = [[' '] * 20]
+        for start in range(0, 400, 20):
+            board.append([STONES[cell] for cell in self._cells[start:start+20]])
+        return board
+
+    def get_positions(self):
+        """
+        :return: dictionary of alphanumeric positions ('A2') to 'B', 'W', or ' '
+        """
+        return {position: STONES[self._cells[(row-1) * 20 + col]] for (row, col), position in LABELS.items()}
+
+    def to_game(self):
+        """
+        :return: GessGame instance in this position, with an empty move stack
+        """
+        game = GessGame()
+        game.set_position(self.get_board(), self.get_turn(), self.get_game_state())
+        return game
+
+
+def footprint(factory, count=1000):
+    """
+    Measures the memory allocated per object by building many of them.
+    :param factory: function of no arguments returning a new object
+    :param count: objects to build (int)
+    :return: average bytes allocated per object (int)
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [factory() for i in range(count)]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    # Leaves out the list that holds the objects.
+    return (allocated - objects.__sizeof__()) // count
+
+
+def main():
+    """
+    Prints the memory held per session as a GessGame and as a GessState.
+    """
+    game = GessGame()
+    for name, factory in (('GessGame', GessGame), ('GessState', lambda: GessState(game))):
+        size = footprint(factory)
+        print('{:<10} {:>7} bytes per session, {:>10} sessions per GiB'.format(name, size, (1 << 30) // size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+# Description: Terminal rendering of the Gess game board with ANSI escape sequences.
+
+import sys
+
+# Cell text by board value, and the style restored for a redrawn cell in live mode.
+CELLS = {'B': u'\u001b[34;1mB\u001b[35m', 'W': u'\u001b[30;1mW\u001b[35m', ' ': ' '}
+CELL_STYLE = '\u001b[0m\u001b[4m\u001b[35m'
+
+
+def render_board(board, column_header):
+    """
+    Builds one frame of the colorful game board.
+    :param board: game board, rows 1-20 and columns 0-19 (list of lists)
+    :param column_header: column letters (list of strings)
+    :return: the frame, ending with a newline (string)
+    """
+    # Provides spacing for column header alignment and adds column headers.
+    parts = ['   ']
+    for i in column_header:
+        parts.append('\u001b[4m\u001b[1m\u001b[95m ' + i + ' ')
+    parts.append('\033[04m\033[35m\n')
+
+    for i in range(1, 21):
+
+        # Assists with alignment for single and double digit row numbers.
+        if i < 10:
+            parts.append('\u001b[4m\u001b[95m' + str(i) + '\033[35m  ')
+        else:
+            parts.append('\u001b[4m\u001b[95m' + str(i) + '\033[35m ')
+
+        # Creates columns to complete game board.
+        for j in range(20):
+            parts.append(u'\u2502' + CELLS[board[i][j]] + ' ')
+        parts.append(u'\u2502\n')
+    parts.append('\033[00m\n')
+    return ''.join(parts)
+
+
+def print_board(board, column_header, output=None):
+    """
+    Uses ANSI Escape Sequences to print a colorful game board in a single write.
+    :param board: game board, rows 1-20 and columns 0-19 (list of lists)
+    :param column_header: column letters (list of strings)
+    :param output: writable text stream, defaults to sys.stdout
+    :return: None
+    """
+    # Enables ANSI Escape Sequences to operate on Windows 10.
+    # import os
+    # os.system("")
+
+    (output or sys.stdout).write(render_board(board, column_header))
+
+
+class TerminalView:
+    """
+    Keeps a game board on screen for spectating. The first frame clears the terminal and draws
+    the whole board, and later frames move the cursor to each square changed since the last
+    frame and rewrite only that square, in one write per frame.
+    """
+    def __init__(self, column_header=None, output=None):
+        """
+        Initializes the output stream and the last board drawn.
+        :param column_header: column letters, defaults to A-T (list of strings)
+        :param output: writable text stream, defaults to sys.stdout
+        """
+        self._column_header = column_header or [chr(x) for x in range(ord('A'), ord('U'))]
+        self._output = output or sys.stdout
+        self._cells = None
+
+    def render(self, board, status=''):
+        """
+        Builds the escape sequences updating the screen to a board.
+        :param board: game board, rows 1-20 and columns 0-19 (list of lists)
+        :param status: line shown below the board, such as the player turn (string)
+        :return: frame to write (string)
+        """
+        if self._cells is None:
+            parts = ['\033[H\033[2J', render_board(board, self._column_header)]
+        else:
+            parts = []
+            for i in range(1, 21):
+                for j in range(20):
+                    if board[i][j] != self._cells[i][j]:
+                        # Row i is on line i+1, and column j's stone is on column 3j+5.
+                        parts.append('\033[{};{}H'.format(i + 1, 3 * j + 5) + CELL_STYLE +
+                                     CELLS[board[i][j]] + '\033[00m')
+        self._cells = [row[:] for row in board]
+
+        # Rewrites the status line under the board and leaves the cursor below it.
+        parts.append('\033[23;1H\033[2K' + status + '\n')
+        return ''.join(parts)
+
+    def draw(self, board, status=''):
+        """
+        Updates the screen to a board with a single write.
+        :param board: game board, rows 1-20 and columns 0-19 (list of lists)
+        :param status: line shown below the board (string)
+        :return: None
+        """
+        self._output.write(self.render(board, status))
+        self._output.flush()
+
+
+def main():
+    """
+    Plays random moves from the initial layout, redrawing the board live in the terminal.
+    """
+    import argparse
+    import random
+    import time
+    from GessGame import GessGame
+    from gess_mcts import random_move
+
+    parser = argparse.ArgumentParser(description='Watch a random Gess game in the terminal.')
+    parser.add_argument('--delay', type=float, default=0.2, help='seconds between moves')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    game, view, rng = GessGame(), TerminalView(), random.Random(args.seed)
+    view.draw(game.get_board(), game.get_turn() + ' to move')
+    while game.get_game_state() == 'UNFINISHED':
+        move = random_move(game, rng)
+        if move is None:
+            break
+        view.draw(game.get_board(), move[0] + '-' + move[1] + ', ' + game.get_turn() + ' to move')
+        time.sleep(args.delay)
+    view.draw(game.get_board(), game.get_game_state())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+# Description: Round-robin and gauntlet tournaments between Gess player configurations, played in
+# parallel across processes, with Elo estimates and 95% confidence intervals.
+#
+# A player configuration is written name[:movetime[:depth]], such as 'engine:200' or 'engine:100:3',
+# where name is one of gess_selfplay.PLAYERS, movetime is milliseconds per move, and depth limits
+# engine search. An openings file holds one opening per line as moves such as 'c3-c5 r18-r15',
+# with blank lines and lines starting with '#' ignored. Every opening is played once with each
+# player as BLACK.
+
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from GessGame import GessGame, validate_moves
+from gess_book import OpeningBook
+from gess_engine import GessEngine
+from gess_mcts import MCTSPlayer
+from gess_records import write_records
+from gess_selfplay import PLAYERS, make_player
+
+# Score of a game for BLACK by game state. Games reaching the move limit are drawn.
+SCORES = {'BLACK_WON': 1.0, 'WHITE_WON': 0.0, 'UNFINISHED': 0.5}
+
+# Moves a player's remaining clock time is spread over under a time control.
+MOVES_TO_GO = 30
+
+
+def parse_player(spec):
+    """
+    :param spec: player configuration, name[:movetime[:depth]] (string)
+    :return: (name, movetime in milliseconds, depth or None) tuple
+    :raises ValueError: if the name is not one of PLAYERS or a number is malformed
+    """
+    parts = spec.split(':')
+    if parts[0] not in PLAYERS or len(parts) > 3:
+        raise ValueError('bad player configuration ' + spec)
+    movetime = int(parts[1]) if len(parts) > 1 else 100
+    depth = int(parts[2]) if len(parts) > 2 else None
+    return parts[0], movetime, depth
+
+
+def parse_time_control(text):
+    """
+    :param text: base and increment seconds per player, such as '60+0.5' (string)
+    :return: (base, increment) tuple of seconds (floats)
+    """
+    base, plus, increment = text.partition('+')
+    return float(base), float(increment or 0)
+
+
+def load_openings(path):
+    """
+    :param path: openings file path (string)
+    :return: list of openings, each a list of (start, end) alphanumeric position tuples
+    :raises ValueError: if an opening has a malformed or illegal move
+    """
+    openings = []
+    with open(path) as stream:
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            moves = [tuple(move.split('-')) for move in line.split()]
+            if any(len(move) != 2 for move in moves) or validate_moves(moves) is not None:
+                raise ValueError('illegal move in opening on line ' + str(number))
+            openings.append(moves)
+    return openings
+
+
+def schedule(players, openings, rounds=1, gauntlet=False):
+    """
+    Pairs players for every opening with colors reversed, every pair playing each opening twice
+    per round. A gauntlet pairs the first player with each of the others; otherwise every pair plays.
+    :param players: player configurations (list of strings)
+    :param openings: list of openings, each a list of moves
+    :param rounds: times to repeat the schedule (int)
+    :param gauntlet: only pair the first player with the rest (bool)
+    :return: list of (BLACK configuration, WHITE configuration, opening index) tuples
+    """
+    if gauntlet:
+        pairs = [(players[0], other) for other in players[1:]]
+    else:
+        pairs = [(player, other) for i, player in enumerate(players) for other in players[i + 1:]]
+    return [(black, white, index) for j in range(rounds) for player, other in pairs
+            for index in range(len(openings)) for black, white in ((player, other), (other, player))]
+
+
+def make_mover(spec, rng):
+    """
+    :param spec: player configuration (string)
+    :param rng: random.Random instance
+    :return: function making a move in a game within a budget in milliseconds, returning the
+             (start, end) alphanumeric position tuple made, or None if there is no legal move
+    """
+    name, movetime, depth = parse_player(spec)
+    if name in ('random', 'greedy'):
+        player = make_player(name, movetime)
+
+        def sample_move(game, budget):
+            return player(game, rng)
+        return sample_move
+
+    if name == 'engine':
+        engine = GessEngine(movetime, max_depth=depth or 32)
+        search = engine.search
+    else:
+        search = MCTSPlayer(movetime, workers=1, seed=rng.getrandbits(32)).search
+
+    def search_move(game, budget):
+        move = search(game, movetime=budget)
+        if move is not None:
+            game.make_move(*move)
+        return move
+    return search_move
+
+
+def play_match(black, white, opening, time_control=None, max_moves=400, seed=0, book=None):
+    """
+    Plays one game from an opening. Players take moves from the book, if given, at random in
+    proportion to games played, until a position is not in it. Without a time control each
+    player searches for its configured movetime; with one, a player's budget is its remaining
+    clock time over MOVES_TO_GO plus the increment, and a player out of time loses. A player
+    without a legal move also loses.
+    :param black: BLACK player configuration (string)
+    :param white: WHITE player configuration (string)
+    :param opening: moves played before the players take over (list of tuples)
+    :param time_control: (base, increment) tuple of seconds per player, or None
+    :param max_moves: moves, counting the opening, after which the game is drawn (int)
+    :param seed: random seed for sampling players (int)
+    :param book: opening book file path (string), or None
+    :return: (list of (start, end) alphanumeric position tuples, game state) pair
+    :raises ValueError: if the opening has an illegal move
+    """
+    rng = random.Random(seed)
+    movers = {'BLACK': make_mover(black, rng), 'WHITE': make_mover(white, rng)}
+    game, moves = GessGame(), list(opening)
+    count = game.apply_moves(moves)
+    if count < len(moves):
+        raise ValueError('illegal move in opening: ' + '-'.join(moves[count]))
+    if book is not None:
+        with OpeningBook(book) as opening_book:
+            move = opening_book.choose_move(game, rng)
+            while move is not None and len(moves) < max_moves and game.make_move(*move):
+                moves.append(move)
+                move = opening_book.choose_move(game, rng)
+    clocks = {'BLACK': time_control[0], 'WHITE': time_control[0]} if time_control else None
+    while game.get_game_state() == 'UNFINISHED' and len(moves) < max_moves:
+        turn = game.get_turn()
+        budget = None
+        if clocks is not None:
+            budget = int(1000 * (clocks[turn] / MOVES_TO_GO + time_control[1]))
+        start = time.monotonic()
+        move = movers[turn](game, budget)
+        if clocks is not None:
+            clocks[turn] -= time.monotonic() - start
+
+            # A move made after the player ran out of time does not count.
+            if clocks[turn] < 0:
+                return moves, 'WHITE_WON' if turn == 'BLACK' else 'BLACK_WON'
+            clocks[turn] += time_control[1]
+        if move is None:
+            game.resign_game()
+            break
+        moves.append(move)
+    return moves, game.get_game_state()
+
+
+def elo_difference(wins, losses, draws):
+    """
+    Estimates the Elo difference from a score with a 95% confidence interval, using the normal
+    approximation to the mean score per game. The variance per game is at least that of the same
+    number of games with one win and one loss and the rest drawn, so all-drawn or one-sided small
+    samples do not report a margin of zero.
+    :param wins: games won (int)
+    :param losses: games lost (int)
+    :param draws: games drawn (int)
+    :return: (Elo difference, error margin) tuple of floats, infinite when a bound is a perfect score
+    """
+    games = wins + losses + draws
+    if games == 0:
+        return 0.0, math.inf
+    score = (wins + draws / 2) / games
+    variance = (wins * (1 - score) ** 2 + losses * score ** 2 + draws * (0.5 - score) ** 2) / games
+    variance = max(variance, 0.5 / games)
+    error = 1.96 * math.sqrt(variance / games)
+
+    def elo(fraction):
+        if fraction <= 0:
+            return -math.inf
+        if fraction >= 1:
+            return math.inf
+        return -400 * math.log10(1 / fraction - 1) + 0.0
+    low, high = elo(score - error), elo(score + error)
+    return elo(score), (high - low) / 2 if math.isfinite(low) and math.isfinite(high) else math.inf
+
+
+def standings(results):
+    """
+    :param results: list of (BLACK configuration, WHITE configuration, moves, game state) tuples
+    :return: (dict of configuration to [wins, losses, draws] against all opponents,
+              dict of (configuration, opponent) to [wins, losses, draws]) tuple
+    """
+    totals, pairs = {}, {}
+    for black, white, moves, game_state in results:
+        score = SCORES[game_state]
+        for player, opponent, result in ((black, white, score), (white, black, 1 - score)):
+            column = 0 if result == 1 else 1 if result == 0 else 2
+            totals.setdefault(player, [0, 0, 0])[column] += 1
+            pairs.setdefault((player, opponent), [0, 0, 0])[column] += 1
+    return totals, pairs
+
+
+def run(players, openings=None, rounds=1, gauntlet=False, time_control=None, workers=None, max_moves=400,
+        seed=0, progress=None, book=None):
+    """
+    Plays a tournament with one match per task across worker processes.
+    :param players: player configurations (list of strings)
+    :param openings: list of openings, defaults to the initial layout only
+    :param rounds: times to repeat the schedule (int)
+    :param gauntlet: only pair the first player with the rest (bool)
+    :param time_control: (base, increment) tuple of seconds per player, or None for fixed movetimes
+    :param workers: number of processes, defaults to the CPU count (int)
+    :param max_moves: moves after which a game is drawn (int)
+    :param seed: seed for sampling players, varied by match number (int)
+    :param progress: called with each (BLACK, WHITE, moves, game state) result as it finishes
+    :param book: opening book file path, mapped by every worker (string), or None
+    :return: list of (BLACK configuration, WHITE configuration, moves, game state) tuples in schedule order
+    """
+    for spec in players:
+        parse_player(spec)
+    openings = openings or [[]]
+    matches = schedule(players, openings, rounds, gauntlet)
+    results = [None] * len(matches)
+    with ProcessPoolExecutor(workers or os.cpu_count() or 1) as executor:
+        futures = {executor.submit(play_match, black, white, openings[index], time_control, max_moves,
+                                   seed + number, book): number
+                   for number, (black, white, index) in enumerate(matches)}
+        for future in as_completed(futures):
+            number = futures[future]
+            black, white, index = matches[number]
+            results[number] = (black, white) + future.result()
+            if progress is not None:
+                progress(results[number])
+    return results
+
+
+def main():
+    """
+    Parses command line options, plays the tournament, and prints Elo standings.
+    """
+    parser = argparse.ArgumentParser(description='Play a Gess tournament between player configurations.')
+    parser.add_argument('players', nargs='+', help='configurations such as engine:200 greedy random')
+    parser.add_argument('--gauntlet', action='store_true', help='pair the first player with each of the others')
+    parser.add_argument('--openings', help='openings file, one opening of moves such as c3-c5 per line')
+    parser.add_argument('--rounds', type=int, default=1)
+    parser.add_argument('--time-control', type=parse_time_control, default=None,
+                        help='seconds per player and increment, such as 60+0.5')
+    parser.add_argument('--workers', type=int, default=None, help='defaults to the CPU count')
+    parser.add_argument('--max-moves', type=int, default=400, help='moves before a game is drawn')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--book', help='opening book file built by gess_book.py')
+    parser.add_argument('--records', help='record file to write the games to')
+    args = parser.parse_args()
+
+    openings = load_openings(args.openings) if args.openings else None
+    start = time.monotonic()
+    finished = []
+
+    def progress(result):
+        finished.append(result)
+        print('game', len(finished), result[0], 'vs', result[1], result[3], len(result[2]), 'moves', flush=True)
+    results = run(args.players, openings, args.rounds, args.gauntlet, args.time_control, args.workers,
+                  args.max_moves, args.seed, progress, args.book)
+    print(len(results), 'games in {:.1f}s'.format(time.monotonic() - start))
+
+    totals, pairs = standings(results)
+    print('{:<24} {:>6} {:>6} {:>6} {:>8} {:>8}'.format('player', 'wins', 'losses', 'draws', 'elo', '+/-'))
+    for spec in args.players:
+        elo, margin = elo_difference(*totals.get(spec, [0, 0, 0]))
+        print('{:<24} {:>6} {:>6} {:>6} {:>8.1f} {:>8.1f}'.format(spec, *totals.get(spec, [0, 0, 0]), elo, margin))
+    for (spec, opponent), counts in sorted(pairs.items()):
+        if not args.gauntlet or spec == args.players[0]:
+            elo, margin = elo_difference(*counts)
+            print('  {} vs {}: +{} -{} ={}, elo {:.1f} +/- {:.1f}'.format(spec, opponent, *counts, elo, margin))
+
+    if args.records:
+        with open(args.records, 'wb') as stream:
+            write_records(stream, ((moves, game_state) for black, white, moves, game_state in results), index=True)
+
+
+if __name__ == '__main__':
+    main()
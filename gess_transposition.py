@@ -0,0 +1,94 @@
+# Description: Bounded transposition table for caching search and analysis results by position hash.
+
+# Bound types for a stored score.
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of search results keyed by GessGame.get_hash(). Each hash maps to one slot.
+    When two positions compete for a slot, the entry searched deeper wins, unless the stored entry
+    is left over from an earlier search, in which case it is always replaced.
+    """
+    def __init__(self, size=1 << 20):
+        """
+        Initializes the table slots and lookup statistics.
+        :param size: number of slots, rounded down to a power of two (int)
+        """
+        self._mask = (1 << (max(size, 1).bit_length() - 1)) - 1
+        self._slots = [None] * (self._mask + 1)
+        self._generation = 0
+        self._count = 0
+        self._probes = 0
+        self._hits = 0
+
+    def __len__(self):
+        """
+        :return: number of filled slots (int)
+        """
+        return self._count
+
+    def get_size(self):
+        """
+        :return: number of slots (int)
+        """
+        return self._mask + 1
+
+    def get_hit_rate(self):
+        """
+        :return: fraction of probes that found their position (float)
+        """
+        if self._probes == 0:
+            return 0.0
+        return self._hits / self._probes
+
+    def new_search(self):
+        """
+        Marks every stored entry as belonging to an earlier search, so it may be replaced.
+        :return: None
+        """
+        self._generation += 1
+
+    def clear(self):
+        """
+        Empties every slot.
+        :return: None
+        """
+        self._slots = [None] * (self._mask + 1)
+        self._count = 0
+
+    def probe(self, key):
+        """
+        Looks up a position.
+        :param key: position hash (int)
+        :return: (depth, score, bound, move) tuple, or None if the position is not stored
+        """
+        self._probes += 1
+        entry = self._slots[key & self._mask]
+        if entry is None or entry[0] != key:
+            return None
+        self._hits += 1
+        return entry[1:5]
+
+    def store(self, key, depth, score, bound=EXACT, move=None):
+        """
+        Saves a result, unless its slot holds a deeper result for another position from this search.
+        :param key: position hash (int)
+        :param depth: search depth the result was computed to (int)
+        :param score: score of the position (int or float)
+        :param bound: EXACT, LOWER, or UPPER
+        :param move: best (start, end) move found, if any (tuple)
+        :return: True if the result was saved, else False
+        """
+        index = key & self._mask
+        entry = self._slots[index]
+        if entry is None:
+            self._count += 1
+        elif entry[0] != key and entry[5] == self._generation and entry[1] > depth:
+            return False
+        elif entry[0] == key and move is None:
+            move = entry[4]
+        self._slots[index] = (key, depth, score, bound, move, self._generation)
+        return True
@@ -9,6 +9,7 @@ try:
     from socket import *
     from pygame.locals import *
     from GessGame import GessGame, GessBoard
+    from gess_engine import GessEngine
 except ImportError:
     print("Could not load module: ImportError.")
     sys.exit(2)
@@ -32,79 +33,190 @@ def load_image(name):
     return image
 
 
-def update_board(screen, background):
+class BoardRenderer:
     """
-    Initializes and updates the visual components of
-    the game board to include changes in stone positions.
-    :param screen: pygame display object
-    :param background: jpg image
-    :return: updated coordinates dictionary
+    Draws the game board on the screen. Images and fonts are loaded once, and the background,
+    grid, and headers are drawn once to a cached surface. After a move only the squares that
+    changed are redrawn, and only their rectangles are sent to the display.
     """
-    # Creates an outline of the game board.
-    line = pygame.Rect(50, 50, 600, 600)
-    pygame.draw.rect(background, steel, line, 3)
-    bs_image = load_image('blackstone.png')
-    ws_image = load_image('whitestone.png')
-
-    # Creates the game board grid from the back end and saves
-    # each Rect object in a list for later dictionary mapping.
-    grid_rects = []
-    for i in range(20):
-
-        for j in range(20):
-            if game.get_board()[j+1][i] == 'B':
-                rect = pygame.Rect(50+(30 * i), 50+(30 * j), 30, 30)
-                grid_rects.append(rect)
-                image_rect = (52+(30 * i), 52+(30 * j))
-                background.blit(bs_image, image_rect)
-                pygame.draw.rect(background, steel, rect, 1)
-
-            elif game.get_board()[j+1][i] == 'W':
-                rect = pygame.Rect(50+(30 * i), 50+(30 * j), 30, 30)
-                grid_rects.append(rect)
-                image_rect = (52+(30 * i), 52+(30 * j))
-                background.blit(ws_image, image_rect)
-                pygame.draw.rect(background, steel, rect, 1)
+    def __init__(self, screen):
+        """
+        Loads images and fonts and draws the static parts of the board.
+        :param screen: pygame display object
+        """
+        self._screen = screen
+        self._bs_image = load_image('blackstone.png')
+        self._ws_image = load_image('whitestone.png')
+        self._text_font = pygame.font.SysFont('sfnsdisplaycondensedregularotf', 20)
+        self._header_font = pygame.font.SysFont('copperplatettc', 20)
+        self._static = self.draw_static(load_image('board_bg.jpg'))
+        self._status = pygame.Rect(0, 660, screen.get_width(), screen.get_height() - 660)
+        self._cells = None
+        self._marks = []
 
-            else:
-                rect = pygame.Rect(50+(30 * i), 50+(30 * j), 30, 30)
-                grid_rects.append(rect)
-                pygame.draw.rect(background, steel, rect, 1)
-
-    # Adds visualization to differentiate player turns.
-    font = pygame.font.SysFont('sfnsdisplaycondensedregularotf', 20)
-    text = font.render("Player Turn: ", True, steel)
-    background.blit(text, (10, 670))
-
-    if game.get_turn() == "BLACK":
-        image_rect = (105, 670)
-        background.blit(bs_image, image_rect)
-    else:
-        image_rect = (105, 670)
-        background.blit(ws_image, image_rect)
-    screen.blit(background, (0, 0))
-
-    # Adds text column headers to the game board.
-    font = pygame.font.SysFont('copperplatettc', 20)
-    for i in range(len(letters)):
-        if letters[i] == 'I':
-            text = font.render(letters[i], True, steel)
-            screen.blit(text, (62+(i * 30), 28))
-        else:
-            text = font.render(letters[i], True, steel)
-            screen.blit(text, (58+(i * 30), 28))
-
-    # Adds text row headers to the game board.
-    for i in range(len(nums)-11):
-        text = font.render(str(nums[i]), True, steel)
-        screen.blit(text, (31, 56+(i * 30)))
-    for i in range(9, len(nums)):
-        text = font.render(str(nums[i]), True, steel)
-        screen.blit(text, (21, 56+(i * 30)))
-
-    # Updates dictionary of all rect objects.
-    coordinates = update_dict(grid_rects)
-    return coordinates
+        # Creates the game board grid in column order for the coordinates dictionary.
+        grid_rects = [self.cell_rect(row, col) for col in range(20) for row in range(1, 21)]
+        self._coordinates = update_dict(grid_rects)
+
+    def get_coordinates(self):
+        """
+        :return: dictionary of alphanumeric position ('A2') to that square's Rect object
+        """
+        return self._coordinates
+
+    def cell_rect(self, row, col):
+        """
+        :param row: board row, 1-20 (int)
+        :param col: board column, 0-19 (int)
+        :return: Rect object of the square on the screen
+        """
+        return pygame.Rect(50+(30 * col), 50+(30 * (row-1)), 30, 30)
+
+    def position_at(self, pos):
+        """
+        Finds the square under a pixel position by arithmetic on the grid layout.
+        :param pos: (x, y) pixel position on the screen
+        :return: alphanumeric position of the square, such as 'C3', or None if off the board
+        """
+        col, row = (pos[0] - 50) // 30, (pos[1] - 50) // 30
+        if 0 <= col < 20 and 0 <= row < 20:
+            return letters[col] + str(row + 1)
+        return None
+
+    def draw_static(self, background):
+        """
+        Draws the board outline, grid, headers, and turn caption on the background.
+        :param background: jpg image
+        :return: the background, for caching
+        """
+        # Creates an outline of the game board and its grid.
+        line = pygame.Rect(50, 50, 600, 600)
+        pygame.draw.rect(background, steel, line, 3)
+        for row in range(1, 21):
+            for col in range(20):
+                pygame.draw.rect(background, steel, self.cell_rect(row, col), 1)
+
+        # Adds text column headers to the game board.
+        for i in range(len(letters)):
+            text = self._header_font.render(letters[i], True, steel)
+            background.blit(text, (62+(i * 30) if letters[i] == 'I' else 58+(i * 30), 28))
+
+        # Adds text row headers to the game board.
+        for i in range(len(nums)):
+            text = self._header_font.render(str(nums[i]), True, steel)
+            background.blit(text, (31 if i < 9 else 21, 56+(i * 30)))
+
+        text = self._text_font.render("Player Turn: ", True, steel)
+        background.blit(text, (10, 670))
+        return background
+
+    def draw_cell(self, row, col, value):
+        """
+        Redraws one square from the cached background and the stone on it.
+        :param row: board row, 1-20 (int)
+        :param col: board column, 0-19 (int)
+        :param value: 'B', 'W', or ' ' (string)
+        :return: Rect object of the square
+        """
+        rect = self.cell_rect(row, col)
+        self._screen.blit(self._static, rect, rect)
+        if value == 'B':
+            self._screen.blit(self._bs_image, (rect.x + 2, rect.y + 2))
+        elif value == 'W':
+            self._screen.blit(self._ws_image, (rect.x + 2, rect.y + 2))
+        pygame.draw.rect(self._screen, steel, rect, 1)
+        return rect
+
+    def draw_status(self, game, message=None):
+        """
+        Redraws the area below the board: the player turn, then the winner or a message.
+        :param game: GessGame instance
+        :param message: text to show, such as an invalid move notice (string)
+        :return: Rect object of the area
+        """
+        self._screen.blit(self._static, self._status, self._status)
+        self._screen.blit(self._bs_image if game.get_turn() == "BLACK" else self._ws_image, (105, 670))
+
+        # Adds text to game board if a player won.
+        if game.get_game_state() != 'UNFINISHED':
+            winner = "Black" if game.get_game_state() == 'BLACK_WON' else "White"
+            text1 = self._header_font.render("Game Over.", True, red)
+            text2 = self._header_font.render(winner + " Player Wins!", True, red)
+            self._screen.blit(text1, (295, 675))
+            self._screen.blit(text2, (255, 700))
+        elif message is not None:
+            text = self._text_font.render(message, True, steel)
+            self._screen.blit(text, (10, 705))
+        return self._status
+
+    def draw(self, game):
+        """
+        Draws the whole board and sends it to the display.
+        :param game: GessGame instance
+        :return: None
+        """
+        self._screen.blit(self._static, (0, 0))
+        self._cells = [row[:] for row in game.get_board()]
+        for row in range(1, 21):
+            for col in range(20):
+                if self._cells[row][col] != ' ':
+                    self.draw_cell(row, col, self._cells[row][col])
+        self._marks = []
+        self.draw_status(game)
+        pygame.display.update()
+
+    def update(self, game, message=None):
+        """
+        Clears selection outlines, redraws the squares whose stones changed since the last
+        drawing and the status area, and sends only those areas to the display.
+        :param game: GessGame instance
+        :param message: text to show below the board (string)
+        :return: None
+        """
+        rects = []
+        for mark, (row, col), reach in self._marks:
+            self._screen.blit(self._static, mark, mark)
+            for mark_row in range(max(row-reach, 1), min(row+reach+1, 21)):
+                for mark_col in range(max(col-reach, 0), min(col+reach+1, 20)):
+                    self.draw_cell(mark_row, mark_col, self._cells[mark_row][mark_col])
+            rects.append(mark)
+        self._marks = []
+
+        board = game.get_board()
+        for row in range(1, 21):
+            for col in range(20):
+                if board[row][col] != self._cells[row][col]:
+                    self._cells[row][col] = board[row][col]
+                    rects.append(self.draw_cell(row, col, board[row][col]))
+        rects.append(self.draw_status(game, message))
+        pygame.display.update(rects)
+
+    def mark(self, position):
+        """
+        Adds a red outline around the footprint of a selected square.
+        :param position: alphanumeric position, such as 'C3' (string)
+        :return: None
+        """
+        rect = self._coordinates[position].inflate(60, 60)
+        pygame.draw.rect(self._screen, red, rect, 4)
+        row, col = int(position[1:]), letters.index(position[0])
+        self._marks.append((rect, (row, col), 1))
+        pygame.display.update(rect)
+
+    def mark_destinations(self, positions):
+        """
+        Outlines every square a selected piece may move to, sending them to the display together.
+        :param positions: alphanumeric positions, such as 'C5' (list of strings)
+        :return: None
+        """
+        rects = []
+        for position in positions:
+            rect = self._coordinates[position]
+            pygame.draw.rect(self._screen, green, rect.inflate(-4, -4), 2)
+            row, col = int(position[1:]), letters.index(position[0])
+            self._marks.append((rect, (row, col), 0))
+            rects.append(rect)
+        pygame.display.update(rects)
 
 
 def update_dict(grid_rects):
@@ -132,82 +244,71 @@ def main():
     pygame.init()
     x, y = 700, 740
 
-    # Initializes the PyGame screen, background, and mapping dict.
+    # Initializes the PyGame screen and board renderer.
     screen = pygame.display.set_mode((x, y))
     icon = load_image('gameicon.png')
-    background = load_image('board_bg.jpg')
     pygame.display.set_icon(icon)
     pygame.display.set_caption('Gess')
-    coordinates = update_board(screen, background)
-    pygame.display.update()
+    renderer = BoardRenderer(screen)
+    renderer.draw(game)
     clicks = []
 
+    # Queues only the events the game handles, so mouse motion does not wake the loop.
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed([pygame.QUIT, pygame.MOUSEBUTTONDOWN])
+
     # Initiates the game loop.
     while True:
 
+        # Sleeps until the next event, so an idle board uses no CPU.
+        event = pygame.event.wait()
+
         # Clicking on window exit button ends game.
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                quit()
-
-            # Locates click coordinates in dict and adds red outline to enhance footprint.
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                for click in range(0, 1):
-                    for key, value in coordinates.items():
-                        if value.collidepoint(event.pos):
-                            clicks.append(key)
-                            rect = pygame.Rect(value)
-                            inflated = rect.inflate(60, 60)
-                            pygame.draw.rect(background, red, inflated, 4)
-                            screen.blit(background, (0, 0))
-                            update_board(screen, background)
-                            pygame.display.update()
-                print(clicks)
-
-            # Waits for second location coordinate.
-            if len(clicks) < 2:
-                continue
-
-            # Calls location coordinates with make_move and updates game board.
+        if event.type == pygame.QUIT:
+            quit()
+
+        # Locates the clicked square and adds red outline to enhance footprint.
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            position = renderer.position_at(event.pos)
+            if position is not None:
+                clicks.append(position)
+                renderer.mark(position)
+
+                # Shows where the selected piece may move.
+                if len(clicks) == 1:
+                    renderer.mark_destinations(game.legal_destinations(position))
+            print(clicks)
+
+        # Waits for second location coordinate.
+        if len(clicks) < 2:
+            continue
+
+        # Calls location coordinates with make_move and updates game board.
+        else:
+            if game.make_move(clicks[0], clicks[1]) is True:
+                clicks.clear()
+                renderer.update(game)
+                print(game.print_board())
+
+                # Lets the computer player reply to the human player's move.
+                if computer is not None and game.get_game_state() == 'UNFINISHED':
+                    move = computer.choose_move(game)
+                    if move is not None:
+                        game.make_move(*move)
+                        renderer.update(game)
+                        print(game.print_board())
+
+            # Adds text to game board if move attempt was invalid.
             else:
-                if game.make_move(clicks[0], clicks[1]) is True:
-                    clicks.clear()
-                    background = load_image('board_bg.jpg')
-                    update_board(screen, background)
-                    pygame.display.update()
-                    print(game.print_board())
-
-                    # Adds text to game board if a player won.
-                    if game.get_game_state() == 'BLACK_WON':
-                        font = pygame.font.SysFont('copperplatettc', 20)
-                        text1 = font.render("Game Over.", True, red)
-                        text2 = font.render("Black Player Wins!", True, red)
-                        screen.blit(text1, (295, 675))
-                        screen.blit(text2, (255, 700))
-                        pygame.display.update()
-                    elif game.get_game_state() == 'WHITE_WON':
-                        font = pygame.font.SysFont('copperplatettc', 20)
-                        text1 = font.render("Game Over.", True, red)
-                        text2 = font.render("White Player Wins!", True, red)
-                        screen.blit(text1, (295, 675))
-                        screen.blit(text2, (255, 700))
-                        pygame.display.update()
-
-                # Adds text to game board if move attempt was invalid.
-                else:
-                    clicks.clear()
-                    background = load_image('board_bg.jpg')
-                    update_board(screen, background)
-                    font = pygame.font.SysFont('sfnsdisplaycondensedregularotf', 20)
-                    text = font.render("Invalid selection. Please try again.", True, steel)
-                    screen.blit(text, (10, 705))
-                    pygame.display.update()
+                clicks.clear()
+                renderer.update(game, "Invalid selection. Please try again.")
 
 
 if __name__ == '__main__':
     """
     Initializes game and board objects from GuessGame file. 
     Creates lists for column/row headers and calls main function.
+    Run with --computer to play BLACK against the computer.
     """
     game = GessGame()
     board = GessBoard()
@@ -216,4 +317,6 @@ if __name__ == '__main__':
     nums = [n for n in range(1, 21)]
     steel = (10, 10, 60)
     red = (175, 0, 30)
+    green = (20, 130, 60)
+    computer = GessEngine() if '--computer' in sys.argv else None
     main()